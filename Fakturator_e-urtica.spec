@@ -1,16 +1,30 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+from PyInstaller.utils.hooks import collect_submodules
+
+# Listy modułów są utrzymywane w build_config.py (wspólne z build.py)
+sys.path.insert(0, SPECPATH)
+from build_config import APP_NAME, HIDDEN_IMPORTS, COLLECT_SUBMODULES, EXCLUDED_MODULES, STRIP_BINARIES
+
+# dict.fromkeys usuwa duplikaty z zachowaniem kolejności - każdy moduł trafia do grafu raz
+hiddenimports = list(dict.fromkeys(
+    [*HIDDEN_IMPORTS, *(name for package in COLLECT_SUBMODULES for name in collect_submodules(package))]
+))
+
+icon_path = os.path.join(SPECPATH, 'app', 'resources', 'icon.ico')
 
 a = Analysis(
-    ['app\\main.py'],
+    [os.path.join('app', 'main.py')],
     pathex=[],
     binaries=[],
     datas=[('config/', 'config/'), ('app/resources/', 'app/resources/')],
-    hiddenimports=['ipaddress', 'collections.abc', 'PyQt6', 'PyQt6.QtWidgets', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.sip', 'playwright', 'pathlib', 'urllib.parse', 'urllib.error', 'xml.etree.ElementTree', 'logging', 'json', 'ssl', 'asyncio', 'nest_asyncio', 'email.mime.multipart', 'email.mime.text', 'email.mime.application', 'subprocess', 'importlib', 'importlib.util', 'pkg_resources.py2_warn', 'pkg_resources._vendor.appdirs', 'pkg_resources._vendor.packaging', 'pkg_resources._vendor.pyparsing', 'dill', 'websockets.client', 'websockets.connection', 'websockets.protocol', '_bootlocale', 'encodings', 'encodings.idna', 'encodings.utf_8', 'encodings.ascii'],
+    hiddenimports=hiddenimports,
     hookspath=[],
     hooksconfig={},
-    runtime_hooks=['scripts\\runtime_hook.py'],
-    excludes=[],
+    runtime_hooks=[os.path.join('scripts', 'runtime_hook.py')],
+    excludes=list(EXCLUDED_MODULES),
     noarchive=False,
     optimize=0,
 )
@@ -21,25 +35,25 @@ exe = EXE(
     a.scripts,
     [],
     exclude_binaries=True,
-    name='Fakturator_e-urtica',
+    name=APP_NAME,
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
+    strip=STRIP_BINARIES,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
     target_arch=None,
     codesign_identity=None,
     entitlements_file=None,
-    icon=['C:\\Users\\szymo\\Desktop\\PlaywrightemQT\\app\\resources\\icon.ico'],
+    icon=[icon_path] if os.path.exists(icon_path) else None,
 )
 coll = COLLECT(
     exe,
     a.binaries,
     a.datas,
-    strip=False,
-    upx=True,
+    strip=STRIP_BINARIES,
+    upx=False,
     upx_exclude=[],
-    name='Fakturator_e-urtica',
+    name=APP_NAME,
 )
@@ -5,10 +5,13 @@ import sys
 from PyQt6.QtWidgets import QApplication
 from app.ui.main_window import MainWindow
 from app.ui.fakturator_window import FakturatorWindow
+from app.utils.playwright_runner import close_all_runners
 
 def main():
     """Uruchamia główne okno aplikacji (MainWindow)."""
     app = QApplication(sys.argv)
+    # Przeglądarki współdzielone przez testy PlaywrightRunner są zamykane przy wyjściu
+    app.aboutToQuit.connect(close_all_runners)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -16,6 +19,8 @@ def main():
 def run_fakturator():
     """Uruchamia okno fakturatora (FakturatorWindow)."""
     app = QApplication(sys.argv)
+    # Przeglądarki współdzielone przez testy PlaywrightRunner są zamykane przy wyjściu
+    app.aboutToQuit.connect(close_all_runners)
     window = FakturatorWindow()
     window.show()
     sys.exit(app.exec())
@@ -14,7 +14,6 @@ import asyncio
 from typing import Dict, Any
 
 from app.utils.logger import setup_logger
-from app.utils.playwright_runner import PlaywrightRunner
 from app.utils.config_manager import ConfigManager
 from app.utils.email_sender import EmailSender
 from app.utils.playwright_manager import PlaywrightManager, check_playwright_availability
@@ -2,25 +2,393 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import stat
+import contextlib
 import sys
+import json
+import time
 import shutil
 import subprocess
+import functools
+import threading
+import collections
+import concurrent.futures
+import importlib
 import importlib.util
-from typing import List, Dict, Tuple, Callable, Optional
+from typing import List, Dict, Tuple, Callable, Optional, NamedTuple
 from pathlib import Path
 from app.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Opcjonalnie szybszy parser JSON (orjson przyjmuje bajty bezpośrednio)
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_LOADS_BYTES = True
+except ImportError:
+    _json_loads = json.loads
+    _JSON_LOADS_BYTES = False
+
+# Limity czasu (w sekundach) dla wywołań zewnętrznych komend
+PROBE_TIMEOUT = 5  # --version, --dry-run, which
+INSTALL_TIMEOUT = 300  # instalacja, aktualizacja i usuwanie
+DRY_RUN_TIMEOUT = 15  # dry-run w pełnej diagnostyce przeglądarek
+
+# Czas (w sekundach), przez który wynik diagnostyki przeglądarek jest ponownie używany
+DIAGNOSTICS_TTL = 30
+
+# Czas (w sekundach), przez który wyniki metod @_memoized są ponownie używane
+MEMO_TTL = 30
+
+# Liczba ostatnich linii wyjścia długich komend zachowywanych do komunikatów o błędach
+STREAM_TAIL_LINES = 50
+
+# Liczba wątków kopiujących pliki przeglądarki
+COPY_WORKERS = 8
+
+# Przedrostki katalogów przeglądarek w cache ms-playwright (do str.startswith)
+_BROWSER_NAMES = ("chromium", "firefox", "webkit")
+
+
+def _memoized(ttl: float):
+    """
+    Zapamiętuje wynik metody PlaywrightManager na `ttl` sekund w słowniku self._memo.
+    
+    Wpisy są usuwane przez _invalidate_status (po instalacji/usunięciu).
+    Wyniki będące słownikami są zwracane jako kopie.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            now = time.monotonic()
+            cached = self._memo.get(method.__name__)
+            if cached is None or now - cached[0] >= ttl:
+                cached = (now, method(self))
+                self._memo[method.__name__] = cached
+            value = cached[1]
+            return dict(value) if isinstance(value, dict) else value
+        return wrapper
+    return decorator
+
+
+# Znaczniki linii w wyjściu `playwright install --dry-run` (po zamianie na małe litery)
+# Jedno wyrażenie dopasowuje oba rodzaje linii, więc wyjście jest skanowane raz
+_DRY_RUN_LINE_RE = re.compile(r"^[ \t]*(browser|install location):[ \t]*(\S[^\r\n]*?)?[ \t]*\r?$", re.M)
+
+
+def _parse_dry_run_output(output: str) -> Dict[str, str]:
+    """
+    Wyciąga ścieżki instalacji przeglądarek z wyjścia `playwright install --dry-run`.
+    
+    Wyjście jest przeglądane jednokrotnie; linia "install location:" jest
+    przypisywana do przeglądarki z ostatnio napotkanej linii "browser:".
+    
+    Args:
+        output: Wyjście komendy (zamienione na małe litery)
+        
+    Returns:
+        dict: Słownik {nazwa przeglądarki: ścieżka instalacji}
+    """
+    install_locations = {}
+    current_browser = None
+    for match in _DRY_RUN_LINE_RE.finditer(output):
+        kind, value = match.group(1), match.group(2) or ""
+        if kind == "browser":
+            browser_info = value.split(None, 1)
+            current_browser = browser_info[0] if browser_info else None
+        elif current_browser and value:
+            install_locations.setdefault(current_browser, value)
+    return install_locations
+
+
+def _fast_copyfile(src, dst):
+    """
+    Kopiuje plik z pominięciem pętli odczytu/zapisu w Pythonie.
+    
+    Na Windows używa CopyFileW (kopiowanie w jądrze razem z atrybutami), na innych
+    systemach shutil.copyfile (sendfile) i osobno shutil.copystat.
+    """
+    if os.name == 'nt':
+        import ctypes
+        if not ctypes.windll.kernel32.CopyFileW(str(src), str(dst), False):
+            raise ctypes.WinError()
+    else:
+        shutil.copyfile(src, dst)
+        shutil.copystat(src, dst)
+    return dst
+
+
+def _copy_file_quietly(src, dst) -> Optional[OSError]:
+    """Kopiuje plik przez _fast_copyfile; zwraca błąd zamiast go zgłaszać (do executor.map)."""
+    try:
+        _fast_copyfile(src, dst)
+    except OSError as e:
+        return e
+    return None
+
+
+def _candidate_target_paths(internal_path: str, app_path: str):
+    """
+    Generuje możliwe ścieżki katalogu .local-browsers wewnątrz aplikacji PyInstaller.
+    
+    Kolejność: standardowa struktura, struktura bez _internal, podwójny _internal.
+    """
+    package_parts = ("playwright", "driver", "package", ".local-browsers")
+    yield os.path.join(internal_path, *package_parts)
+    yield os.path.join(app_path, *package_parts)
+    yield os.path.join(internal_path, "_internal", *package_parts)
+
+
+def _candidate_source_locations(default_cache: str, localappdata: str):
+    """Generuje istniejące systemowe katalogi z przeglądarkami Playwright."""
+    # 1. Standardowy katalog cache
+    cache_dir = default_cache
+    if os.path.isdir(cache_dir):
+        yield cache_dir
+    
+    # 2. Katalog AppData dla Windows
+    if os.name == 'nt':
+        appdata_path = os.path.join(localappdata, "ms-playwright")
+        if os.path.isdir(appdata_path):
+            yield appdata_path
+    
+    # 3. Katalog systemowy dla Linux
+    if os.name == 'posix':
+        system_path = "/usr/local/share/playwright"
+        if os.path.isdir(system_path):
+            yield system_path
+
+
+def _find_chromium_in(location: str) -> Tuple[List[str], List[str]]:
+    """
+    Szuka katalogów chromium-XXXX z poprawnym chrome-win/chrome.exe w jednej lokalizacji.
+    
+    Funkcja nie raportuje postępu sama (działa w wątku roboczym) - zwraca komunikaty
+    do wypisania przez wywołującego.
+    
+    Returns:
+        tuple: (lista katalogów źródłowych, lista komunikatów diagnostycznych)
+    """
+    source_dirs = []
+    messages = []
+    with os.scandir(location) as it:
+        entries = [entry for entry in it if entry.name.startswith("chromium-")]
+    
+    for entry in entries:
+        source_dir = entry.path
+        messages.append(f"📋 OPERACJA KOPIOWANIA: Znaleziono katalog chromium: {source_dir}")
+        
+        # Szczegółowe sprawdzenie zawartości katalogu źródłowego
+        if not entry.is_dir():
+            continue
+        
+        chrome_win_dir = os.path.join(source_dir, "chrome-win")
+        chrome_exe = os.path.join(chrome_win_dir, "chrome.exe")
+        
+        # Sprawdź czy chrome.exe istnieje (jeden stat daje istnienie i rozmiar)
+        chrome_exe_size = _file_size(chrome_exe)
+        
+        # Sprawdź czy katalog chrome-win istnieje (tylko gdy brakuje chrome.exe)
+        if chrome_exe_size is None and not os.path.isdir(chrome_win_dir):
+            messages.append(f"📋 OPERACJA KOPIOWANIA: Katalog chrome-win nie istnieje: {chrome_win_dir}")
+            # Sprawdź zawartość katalogu źródłowego
+            with os.scandir(source_dir) as it:
+                contents = [child.name for child in it]
+            messages.append(f"📋 OPERACJA KOPIOWANIA: Zawartość katalogu: {contents}")
+            continue
+        
+        messages.append(f"📋 OPERACJA KOPIOWANIA: Sprawdzam chrome.exe: {chrome_exe}, istnieje: {chrome_exe_size is not None}")
+        
+        if chrome_exe_size is not None and chrome_exe_size > 1000000:  # Upewnij się, że plik ma odpowiedni rozmiar
+            # To poprawny katalog z przeglądarką
+            source_dirs.append(source_dir)
+    
+    return source_dirs, messages
+
+
+def _rmtree_quietly(path) -> Optional[OSError]:
+    """Usuwa drzewo katalogów; zwraca pierwszy błąd zamiast go zgłaszać (do executor.map)."""
+    try:
+        shutil.rmtree(path)
+    except OSError as e:
+        return e
+    return None
+
+
+def _file_size(path) -> Optional[int]:
+    """Zwraca rozmiar pliku jednym wywołaniem os.stat lub None, jeśli plik nie istnieje."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def _is_dir(path) -> bool:
+    """Sprawdza jednym wywołaniem os.stat, czy ścieżka istnieje i jest katalogiem."""
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+# Względne ścieżki plików wykonywalnych w katalogach <przeglądarka>-<rewizja> ms-playwright
+_SYSTEM_BROWSER_EXECUTABLES = {
+    "chromium": ("chrome-win", "chrome.exe"),
+    "firefox": ("firefox", "firefox.exe" if os.name == 'nt' else "firefox"),
+    "webkit": ("minibrowser", "MiniBrowser.exe" if os.name == 'nt' else "MiniBrowser"),
+}
+
+
+# Przedrostki katalogów <przeglądarka>-<rewizja> (do str.startswith)
+_BROWSER_DIR_PREFIXES = tuple(f"{browser}-" for browser in _SYSTEM_BROWSER_EXECUTABLES)
+
+
+# Para "name"/"revision" w obrębie jednego obiektu z listy "browsers" pliku browsers.json
+_BROWSERS_JSON_RE = re.compile(rb'"name"\s*:\s*"([^"]+)"[^{}]*?"revision"\s*:\s*"([^"]+)"')
+
+
+def _scan_browsers_json(data: bytes) -> Dict[str, str]:
+    """Wyciąga rewizje przeglądarek z browsers.json bez budowania całego drzewa JSON."""
+    return {
+        name.decode('utf-8'): revision.decode('utf-8')
+        for name, revision in _BROWSERS_JSON_RE.findall(data)
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _has_playwright() -> bool:
+    """Sprawdza (jednokrotnie) czy pakiet playwright jest dostępny."""
+    return importlib.util.find_spec("playwright") is not None
+
+
+def _purge_playwright_modules():
+    """Usuwa z sys.modules zaimportowane moduły playwright (np. po instalacji lub usunięciu pakietu)."""
+    if not any(name.startswith('playwright') for name in sys.modules):
+        return
+    for module_name in [name for name in sys.modules if name.startswith('playwright')]:
+        sys.modules.pop(module_name, None)
+        logger.info(f"Usunięto z pamięci moduł: {module_name}")
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_which(name: str) -> Optional[str]:
+    """shutil.which z pamięcią podręczną - wynik jest stały w obrębie procesu."""
+    return shutil.which(name)
+
+
+@functools.lru_cache(maxsize=64)
+def _path_exists(path: str) -> bool:
+    """os.path.exists z pamięcią podręczną (czyszczoną przez _invalidate_status)."""
+    return os.path.exists(path)
+
+
+@functools.lru_cache(maxsize=1)
+def _system_chrome_candidates(program_files: str, program_files_x86: str, localappdata: str) -> Tuple[str, ...]:
+    """Zwraca standardowe lokalizacje systemowego Chrome na Windows."""
+    return tuple(
+        os.path.join(root, "Google", "Chrome", "Application", "chrome.exe")
+        for root in (program_files, program_files_x86, localappdata)
+    )
+
+
+def _ascend(path: str, levels: int) -> str:
+    """Zwraca katalog położony `levels` poziomów wyżej (jak wielokrotne os.path.dirname)."""
+    return os.path.normpath(path).rsplit(os.sep, levels)[0]
+
+
+class _PyInstallerPaths(NamedTuple):
+    """Ścieżki do wbudowanego Playwright w aplikacji PyInstaller."""
+    base: str
+    internal: str
+    playwright: str
+    driver: str
+    package: str
+    local_browsers: str
+
+
+class _PyInstallerProbe(NamedTuple):
+    """Wynik sprawdzenia układu katalogów aplikacji PyInstaller."""
+    paths: _PyInstallerPaths
+    path_exists: Dict[str, bool]
+    chrome_exe_paths: List[dict]
+
+
+class _StatCache:
+    """Zapamiętuje wyniki os.stat w obrębie jednego wywołania diagnostyki."""
+    
+    def __init__(self):
+        self._results = {}
+    
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.normcase(os.path.abspath(path))
+    
+    def _stat(self, path):
+        key = self._key(path)
+        if key not in self._results:
+            try:
+                self._results[key] = os.stat(path)
+            except (OSError, ValueError):
+                self._results[key] = None
+        return self._results[key]
+    
+    def exists(self, path) -> bool:
+        return self._stat(path) is not None
+    
+    def isdir(self, path) -> bool:
+        st = self._stat(path)
+        return st is not None and stat.S_ISDIR(st.st_mode)
+    
+    def size(self, path) -> int:
+        st = self._stat(path)
+        if st is None:
+            raise FileNotFoundError(path)
+        return st.st_size
+    
+    def invalidate(self, path):
+        """Usuwa zapamiętany wynik, np. po utworzeniu katalogu."""
+        self._results.pop(self._key(path), None)
+
+
 class PlaywrightManager:
     """Klasa do zarządzania instalacją, konfiguracją i usuwaniem Playwright."""
     
     def __init__(self):
         """Inicjalizacja menedżera Playwright."""
-        self.playwright_path = Path.home() / ".cache" / "ms-playwright"
-        self.installed_browsers = self._get_installed_browsers()
+        # Domyślny katalog cache ms-playwright (katalog domowy nie zmienia się w trakcie działania)
+        self._default_cache = Path.home() / ".cache" / "ms-playwright"
+        self._default_cache_str = str(self._default_cache)
+        self.playwright_path = self._default_cache
+        # Systemowe lokalizacje odczytane raz z os.environ
+        self._localappdata = os.environ.get('LOCALAPPDATA', '')
+        self._programfiles = os.environ.get('PROGRAMFILES', 'C:\\Program Files')
+        self._programfiles_x86 = os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')
+        # Zapamiętane wyniki metod oznaczonych @_memoized: {nazwa: (czas, wynik)}
+        self._memo = {}
+        # Zainstalowane przeglądarki są wykrywane dopiero przy pierwszym odczycie installed_browsers
+        self._installed_browsers = None
         self.cache_dir = self._get_cache_dir()
         self.progress_callback = None
+        # Zapamiętany status instalacji i klucz, dla którego jest aktualny
+        self._status_snapshot = None
+        self._status_token = None
+        # Wynik ostatniej diagnostyki przeglądarek (ważny dla danego mtime katalogu cache)
+        self._browsers_cache = None
+        self._browsers_cache_mtime = 0
+        self._browsers_cache_time = 0.0
+        self._last_diagnostics_ok = False
+        # Pełna diagnostyka (ścieżki, browsers.json, AppData, Playwright API) tylko na żądanie
+        self._verbose_diag = os.environ.get("PWMGR_VERBOSE_DIAG") == "1"
+        # Zapamiętane systemowe ścieżki przeglądarek i sygnatura środowiska (z mtime katalogów)
+        self._sys_paths_cache = None
+        self._sys_paths_env_sig = None
+        # Ostatni wynik sprawdzenia układu katalogów PyInstaller
+        self._last_probe = None
+        # Wynik udanej konfiguracji ścieżek i odcisk środowiska, dla którego jest aktualny
+        self._configured_result = None
+        self._configured_env_hash = None
     
     def set_progress_callback(self, callback: Optional[Callable[[str], None]]):
         """Ustawia callback do raportowania postępu operacji.
@@ -30,19 +398,107 @@ class PlaywrightManager:
         """
         self.progress_callback = callback
     
+    @property
+    def installed_browsers(self) -> Dict[str, bool]:
+        """Zainstalowane przeglądarki, wykrywane przy pierwszym odczycie."""
+        if self._installed_browsers is None:
+            self._installed_browsers = self._get_installed_browsers()
+        return self._installed_browsers
+    
+    @installed_browsers.setter
+    def installed_browsers(self, value: Optional[Dict[str, bool]]):
+        self._installed_browsers = value
+    
     def _report_progress(self, message: str):
         """Raportuje postęp operacji."""
         logger.info(message)
         if self.progress_callback:
             self.progress_callback(message)
     
+    def _report_progress_lazy(self, fmt: str, *args):
+        """
+        Raportuje postęp, formatując komunikat dopiero wtedy, gdy ktoś go odbiera.
+        
+        Przeznaczone dla pętli wykonywanych dla każdego pliku. Bez callbacku
+        formatowanie (w stylu str.format) wykonuje loguru tylko dla aktywnych handlerów.
+        
+        Args:
+            fmt: Szablon komunikatu z polami {}
+            *args: Wartości wstawiane do szablonu
+        """
+        if self.progress_callback:
+            self._report_progress(fmt.format(*args))
+        else:
+            logger.info(fmt, *args)
+    
+    def _run_streaming(self, cmd: List[str], timeout: float = INSTALL_TIMEOUT,
+                       check: bool = False) -> subprocess.CompletedProcess:
+        """
+        Uruchamia długą komendę (pip, playwright install) i przekazuje jej wyjście linia po linii.
+        
+        W pamięci trzymane jest tylko STREAM_TAIL_LINES ostatnich linii - trafiają one do
+        stdout i stderr zwracanego CompletedProcess (stderr jest połączony ze stdout).
+        
+        Args:
+            cmd: Komenda do uruchomienia
+            timeout: Limit czasu w sekundach; po jego przekroczeniu proces jest zabijany
+            check: Zgłasza CalledProcessError przy niezerowym kodzie wyjścia
+            
+        Raises:
+            subprocess.TimeoutExpired: Gdy przekroczono limit czasu
+            subprocess.CalledProcessError: Gdy check=True i komenda zakończyła się błędem
+        """
+        tail = collections.deque(maxlen=STREAM_TAIL_LINES)
+        timed_out = threading.Event()
+        
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, errors="replace", bufsize=1) as proc:
+            def kill_on_timeout():
+                timed_out.set()
+                proc.kill()
+            
+            timer = threading.Timer(timeout, kill_on_timeout)
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    line = line.rstrip()
+                    if line:
+                        tail.append(line)
+                        self._report_progress(line)
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+        
+        output = "\n".join(tail)
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout, output=output)
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, output=output, stderr=output)
+        return subprocess.CompletedProcess(cmd, returncode, stdout=output, stderr=output)
+    
+    @contextlib.contextmanager
+    def _progress_buffer(self):
+        """
+        Zbiera komunikaty postępu z jednej sekcji diagnostyki i raportuje je
+        jednym wywołaniem _report_progress po jej zakończeniu.
+        
+        Yields:
+            Callable[[str], None]: Funkcja dodająca komunikat do bufora
+        """
+        messages = []
+        try:
+            yield messages.append
+        finally:
+            if messages:
+                self._report_progress("\n".join(messages))
+    
     def _get_cache_dir(self) -> str:
         """Zwraca ścieżkę do katalogu cache ms-playwright."""
         # Domyślna lokalizacja katalogu cache
         home_dir = os.path.expanduser("~")
-        cache_dir = os.path.join(home_dir, ".cache", "ms-playwright")
+        cache_dir = self._default_cache_str
         
-        if os.path.exists(cache_dir) and os.path.isdir(cache_dir):
+        if _is_dir(cache_dir):
             logger.info(f"Znaleziono katalog ms-playwright: {cache_dir}")
             return cache_dir
         
@@ -53,13 +509,14 @@ class PlaywrightManager:
         ]
         
         for location in alt_locations:
-            if os.path.exists(location) and os.path.isdir(location):
+            if _is_dir(location):
                 logger.info(f"Znaleziono katalog ms-playwright: {location}")
                 return location
         
         logger.warning("Nie znaleziono katalogu ms-playwright, używam domyślnej lokalizacji")
         return cache_dir
     
+    @_memoized(ttl=MEMO_TTL)
     def _get_installed_browsers(self):
         """Sprawdza zainstalowane przeglądarki."""
         browsers = {
@@ -68,117 +525,92 @@ class PlaywrightManager:
             "webkit": False
         }
         
-        # Sprawdź bezpośrednio w katalogu ~/.cache/ms-playwright
+        # Sprawdź bezpośrednio w katalogu ~/.cache/ms-playwright (jeden odczyt katalogu,
+        # obejmuje też katalogi o nazwie dokładnie "chromium"/"firefox"/"webkit")
+        cache_dir = self.playwright_path
+        found = False
         try:
-            cache_dir = Path.home() / ".cache" / "ms-playwright"
-            if cache_dir.exists():
+            with os.scandir(cache_dir) as it:
                 logger.info(f"Znaleziono katalog ms-playwright: {cache_dir}")
                 
-                # Sprawdź listę plików w katalogu
-                for item in cache_dir.iterdir():
-                    item_name = item.name.lower()
-                    for browser in browsers.keys():
+                # Sprawdź listę katalogów w katalogu cache
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    item_name = entry.name.lower()
+                    if not item_name.startswith(_BROWSER_NAMES):
+                        continue
+                    for browser in _BROWSER_NAMES:
                         if item_name.startswith(browser):
                             browsers[browser] = True
-                            logger.info(f"Znaleziono przeglądarkę {browser} w katalogu cache: {item}")
-            else:
-                logger.warning(f"Katalog ms-playwright nie istnieje: {cache_dir}")
+                            found = True
+                            logger.info(f"Znaleziono przeglądarkę {browser} w katalogu cache: {entry.path}")
+                            break
+        except FileNotFoundError:
+            logger.warning(f"Katalog ms-playwright nie istnieje: {cache_dir}")
         except Exception as e:
             logger.error(f"Błąd podczas sprawdzania katalogu ms-playwright: {e}")
         
-        # Standardowa metoda poprzez ścieżki (tylko jeśli nie znaleziono)
-        if not any(browsers.values()) and self.playwright_path.exists():
-            for browser in browsers.keys():
-                browser_path = self.playwright_path / browser
-                if browser_path.exists():
-                    browsers[browser] = True
-                    logger.info(f"Znaleziono przeglądarkę {browser} w standardowej lokalizacji")
+        # Przeglądarki znalezione w cache - nie ma potrzeby dalszego sprawdzania
+        if found:
+            return browsers
         
         # Alternatywna metoda - użyj --dry-run (tylko jeśli nadal nie znaleziono)
-        if not any(browsers.values()):
+        try:
+            # Sprawdźmy najpierw czy komenda playwright istnieje (przeszukanie PATH bez uruchamiania procesu)
             try:
-                # Sprawdźmy najpierw czy komenda playwright istnieje
-                try:
-                    result = subprocess.run(
-                        ['which', 'playwright'], 
-                        capture_output=True, 
-                        text=True
-                    )
-                    
-                    if result.returncode != 0:
-                        logger.warning("Komenda playwright nie jest dostępna w systemie")
-                        return browsers
-                        
-                    result = subprocess.run(
-                        ['playwright', 'install', '--dry-run'], 
-                        capture_output=True, 
-                        text=True
-                    )
-                    output = result.stdout.lower()
-                    
-                    # Logowanie pełnego outputu
-                    logger.info(f"Wynik komendy playwright install --dry-run: {output}")
-                    
-                    # Analizuj output dla każdej przeglądarki
-                    for browser in browsers.keys():
-                        if f"browser: {browser}" in output:
-                            install_path = None
-                            for line in output.split('\n'):
-                                if line.strip().startswith("install location:") and browser in output.split('\n')[output.split('\n').index(line) - 1].lower():
-                                    install_path = line.strip().split("install location:")[1].strip()
-                                    break
-                            
-                            if install_path and os.path.exists(install_path):
-                                browsers[browser] = True
-                                logger.info(f"Przeglądarka {browser} wykryta przez dry-run: {install_path}")
-                except FileNotFoundError:
+                if _cached_which('playwright') is None:
                     logger.warning("Komenda playwright nie jest dostępna w systemie")
-            except Exception as e:
-                logger.error(f"Błąd przy sprawdzaniu przeglądarek przez dry-run: {e}")
-        
+                    return browsers
+                
+                result = subprocess.run(
+                    ['playwright', 'install', '--dry-run'], 
+                    capture_output=True, 
+                    text=True,
+                    timeout=PROBE_TIMEOUT
+                )
+                output = result.stdout.lower()
+                
+                # Logowanie pełnego outputu
+                logger.info(f"Wynik komendy playwright install --dry-run: {output}")
+                
+                # Analizuj output dla każdej przeglądarki (jedno przejście po wyjściu);
+                # ścieżka w wyniku oznacza, że wystąpiła też linia "browser: <nazwa>"
+                install_locations = _parse_dry_run_output(output)
+                for browser in browsers.keys():
+                    install_path = install_locations.get(browser)
+                    if install_path and _path_exists(install_path):
+                        browsers[browser] = True
+                        logger.info(f"Przeglądarka {browser} wykryta przez dry-run: {install_path}")
+            except FileNotFoundError:
+                logger.warning("Komenda playwright nie jest dostępna w systemie")
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Przekroczono limit czasu ({PROBE_TIMEOUT} s) komendy playwright install --dry-run")
+        except Exception as e:
+            logger.error(f"Błąd przy sprawdzaniu przeglądarek przez dry-run: {e}")
+    
         return browsers
     
+    @_memoized(ttl=MEMO_TTL)
     def _check_playwright_import(self) -> bool:
         """Sprawdza, czy możliwy jest import playwright i czy pakiet rzeczywiście działa."""
+        # Jeden import podmodułu - pakiet nadrzędny trafia przy tym do sys.modules,
+        # więc osobne find_spec("playwright") i `import playwright` są zbędne
+        # (bez uruchamiania sync_playwright() - start sterownika Node jest kosztowny)
         try:
-            # Sprawdź czy pakiet jest dostępny
-            spec = importlib.util.find_spec("playwright")
-            if spec is None:
-                logger.warning("Pakiet playwright nie jest zainstalowany (brak specyfikacji modułu)")
-                return False
-
-            # Spróbuj zaimportować
-            import playwright
-            
-            # Sprawdź czy można zaimportować główne komponenty
-            try:
-                from playwright.sync_api import sync_playwright
-                # Wykonaj prosty test aby sprawdzić czy pakiet działa
-                try:
-                    with sync_playwright() as p:
-                        # Samo stworzenie obiektu jest wystarczającym testem
-                        # Nie tworzymy przeglądarki, tylko sprawdzamy, czy moduł działa
-                        if hasattr(p, 'chromium'):
-                            logger.info("Import playwright.sync_api działa poprawnie i pakiet jest funkcjonalny")
-                            return True
-                        else:
-                            logger.warning("Import playwright.sync_api działa, ale pakiet nie jest w pełni funkcjonalny")
-                            return False
-                except Exception as e:
-                    logger.warning(f"Pakiet playwright jest zainstalowany, ale nie działa poprawnie: {e}")
-                    return False
-            except ImportError as e:
-                logger.warning(f"Import playwright.sync_api nie działa: {e}")
-                return False
-            except Exception as e:
-                logger.error(f"Niespodziewany błąd podczas testowania playwright: {e}")
-                return False
-        except ImportError:
-            logger.warning("Import playwright nie działa")
+            from playwright.sync_api import sync_playwright
+        except ImportError as e:
+            logger.warning(f"Import playwright.sync_api nie działa: {e}")
             return False
         except Exception as e:
             logger.error(f"Niespodziewany błąd podczas importu playwright: {e}")
             return False
+        
+        if callable(sync_playwright):
+            logger.info("Import playwright.sync_api działa poprawnie i pakiet jest funkcjonalny")
+            return True
+        logger.warning("Import playwright.sync_api działa, ale pakiet nie jest w pełni funkcjonalny")
+        return False
     
     def check_playwright_installation(self):
         """Sprawdza czy Playwright i przeglądarki są zainstalowane."""
@@ -206,34 +638,101 @@ class PlaywrightManager:
             logger.error(f"Nieoczekiwany błąd podczas sprawdzania Playwright: {str(e)}")
             return False
     
+    @functools.cached_property
+    def _pyinstaller_paths(self) -> _PyInstallerPaths:
+        """Ścieżki do wbudowanego Playwright, liczone raz na obiekt."""
+        base_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+        
+        # Jeśli ścieżka już kończy się na _internal, nie dodawaj tego ponownie
+        if base_path.endswith('_internal'):
+            internal_path = base_path
+        else:
+            internal_path = os.path.join(base_path, "_internal")
+        
+        package_path = os.path.join(internal_path, "playwright", "driver", "package")
+        return _PyInstallerPaths(
+            base=base_path,
+            internal=internal_path,
+            playwright=os.path.join(internal_path, "playwright"),
+            driver=os.path.join(internal_path, "playwright", "driver"),
+            package=package_path,
+            local_browsers=os.path.join(package_path, ".local-browsers")
+        )
+    
+    def _get_status_token(self):
+        """Zwraca klucz ważności zapamiętanego statusu instalacji."""
+        try:
+            cache_mtime = os.stat(self.cache_dir).st_mtime_ns
+        except OSError:
+            cache_mtime = None
+        return (cache_mtime, os.environ.get("PLAYWRIGHT_BROWSERS_PATH"))
+    
+    def _invalidate_status(self):
+        """Unieważnia zapamiętany status instalacji (po instalacji/usunięciu)."""
+        self._status_snapshot = None
+        self._status_token = None
+        self._browsers_cache = None
+        self._sys_paths_cache = None
+        self._last_probe = None
+        self._memo.clear()
+        self._installed_browsers = None
+        # Diagnostyka dotyczyła poprzedniej instalacji - po zmianie trzeba ją powtórzyć
+        self._last_diagnostics_ok = False
+        self.invalidate_configuration_cache()
+        _has_playwright.cache_clear()
+        _cached_which.cache_clear()
+        _path_exists.cache_clear()
+    
     def get_installation_status(self):
         """
         Zwraca status instalacji Playwright.
         
+        Wynik jest zapamiętywany i zwracany ponownie, dopóki nie zmieni się
+        katalog cache ms-playwright ani ścieżka PLAYWRIGHT_BROWSERS_PATH.
+        
         Returns:
             dict: Słownik ze statusem instalacji i przeglądarek.
         """
+        token = self._get_status_token()
+        if self._status_snapshot is not None and token == self._status_token:
+            self._report_progress("Status instalacji Playwright sprawdzony (zapamiętany)")
+            return self._copy_status(self._status_snapshot)
+        
         self._report_progress("Sprawdzanie statusu instalacji Playwright...")
         
-        # Najpierw sprawdź czy pakiet można zaimportować i czy działa
-        try:
-            import_works = self._check_playwright_import()
-        except Exception:
-            import_works = False
+        # Sprawdzenie, czy jesteśmy w środowisku PyInstaller
+        is_frozen = getattr(sys, 'frozen', False)
         
-        # Sprawdź czy komenda playwright jest dostępna
-        try:
-            cmd_works, version = self._check_playwright_command()
-        except Exception:
-            cmd_works = False
-            version = "nieznana"
+        # Import i komenda CLI są od siebie niezależne, więc sprawdzamy je w tle.
+        # Przeglądarki sprawdzamy w wątku wywołującym, bo raportują postęp do GUI
+        # (progress_callback dotyka widżetów Qt); wynik komendy CLI dostają z tego
+        # samego sprawdzenia zamiast uruchamiać je drugi raz. W środowisku PyInstaller
+        # przeglądarki sprawdzamy dopiero po naprawie ścieżek (patrz niżej).
+        browsers = None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            import_future = executor.submit(self._check_playwright_import)
+            cmd_future = executor.submit(self._check_playwright_command)
+            
+            if not is_frozen:
+                browsers = self._check_browsers_safely(cmd_future.result)
+            
+            # Najpierw sprawdź czy pakiet można zaimportować i czy działa
+            try:
+                import_works = import_future.result()
+            except Exception:
+                import_works = False
+            
+            # Sprawdź czy komenda playwright jest dostępna
+            try:
+                cmd_works, version = cmd_future.result()
+            except Exception:
+                cmd_works = False
+                version = "nieznana"
         
         # Playwright jest zainstalowany tylko jeśli import działa
         # Sama komenda CLI może nie działać, zwłaszcza w środowisku pyinstaller/exe
         playwright_installed = import_works
         
-        # Sprawdzenie, czy jesteśmy w środowisku PyInstaller
-        is_frozen = getattr(sys, 'frozen', False)
         if is_frozen and playwright_installed:
             self._report_progress("Wykryto środowisko PyInstaller, sprawdzam ścieżki przeglądarek...")
             try:
@@ -247,10 +746,8 @@ class PlaywrightManager:
                 self._report_progress(f"❌ Błąd podczas konfiguracji ścieżek: {e}")
         
         # Zaktualizuj informacje o przeglądarkach
-        try:
-            browsers = self._check_browser_installations()
-        except Exception:
-            browsers = {"chromium": False, "firefox": False, "webkit": False}
+        if browsers is None:
+            browsers = self._check_browsers_safely(lambda: (cmd_works, version))
         
         # Ostateczny status
         status = {
@@ -263,8 +760,26 @@ class PlaywrightManager:
         logger.info(f"Status instalacji Playwright: pakiet={playwright_installed}, przeglądarki={browsers}")
         self._report_progress("Status instalacji Playwright sprawdzony")
         
+        # Sprawdzanie mogło zmienić PLAYWRIGHT_BROWSERS_PATH, więc klucz liczymy ponownie
+        self._status_snapshot = self._copy_status(status)
+        self._status_token = self._get_status_token()
+        
         return status
     
+    def _check_browsers_safely(self, command_check: Callable[[], Tuple[bool, str]]) -> Dict[str, bool]:
+        """Sprawdza przeglądarki, zwracając wynik "brak przeglądarek" w razie błędu."""
+        try:
+            return self._check_browser_installations(command_check=command_check)
+        except Exception:
+            return {"chromium": False, "firefox": False, "webkit": False}
+    
+    @staticmethod
+    def _copy_status(status):
+        """Zwraca kopię słownika statusu, aby wywołujący nie modyfikowali zapamiętanego stanu."""
+        status_copy = dict(status)
+        status_copy["browsers"] = dict(status["browsers"])
+        return status_copy
+    
     def install_playwright(self, browsers=None):
         """Instaluje Playwright i wybrane przeglądarki."""
         self._report_progress("Rozpoczynam instalację Playwright...")
@@ -272,14 +787,15 @@ class PlaywrightManager:
         try:
             # Sprawdź aktualny stan instalacji
             status = self.get_installation_status()
+            self._invalidate_status()
             
             # Jeśli już zainstalowany, instaluj tylko przeglądarki
             if status["playwright_installed"]:
                 self._report_progress("Pakiet playwright jest już zainstalowany")
                 logger.info("Pakiet playwright jest już zainstalowany, wersja: " + status["playwright_version"])
                 
-                # Instalacja wybranych przeglądarek
-                success, message = self._install_browsers(browsers)
+                # Instalacja wybranych przeglądarek (dostępność komendy znamy już ze statusu)
+                success, message = self._install_browsers(browsers, cmd_success=status["command_available"])
                 
                 # Po instalacji przeglądarek, spróbuj naprawić ścieżki dla PyInstaller
                 if success:
@@ -292,19 +808,10 @@ class PlaywrightManager:
             self._report_progress("Instalowanie pakietu playwright...")
             try:
                 # Usuń stare moduły z pamięci, jeśli istnieją
-                to_remove = [m for m in sys.modules if m.startswith('playwright')]
-                for module_name in to_remove:
-                    if module_name in sys.modules:
-                        del sys.modules[module_name]
-                        logger.info(f"Usunięto z pamięci moduł: {module_name}")
+                _purge_playwright_modules()
                 
-                # Zainstaluj pakiet
-                result = subprocess.run(
-                    [sys.executable, "-m", "pip", "install", "playwright"],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
+                # Zainstaluj pakiet (wyjście przekazywane na bieżąco do raportu postępu)
+                result = self._run_streaming([sys.executable, "-m", "pip", "install", "playwright"])
                 
                 if result.returncode != 0:
                     error_msg = f"Błąd instalacji playwright: {result.stderr}"
@@ -315,8 +822,9 @@ class PlaywrightManager:
                 self._report_progress("Pakiet playwright zainstalowany pomyślnie")
                 logger.info("Pakiet playwright zainstalowany pomyślnie")
                 
-                # Instalacja przeglądarek
-                success, message = self._install_browsers(browsers)
+                # Instalacja przeglądarek przez ten sam interpreter, którym właśnie
+                # zainstalowano pakiet - skrypt `playwright` może jeszcze nie być w PATH
+                success, message = self._install_browsers(browsers, cmd_success=False)
                 
                 # Po instalacji przeglądarek, spróbuj naprawić ścieżki dla PyInstaller
                 if success:
@@ -325,6 +833,11 @@ class PlaywrightManager:
                     
                 return success, message
                 
+            except subprocess.TimeoutExpired:
+                error_msg = f"Przekroczono limit czasu ({INSTALL_TIMEOUT} s) instalacji pakietu playwright"
+                logger.error(error_msg)
+                self._report_progress(f"Błąd: {error_msg}")
+                return False, error_msg
             except Exception as e:
                 error_msg = f"Nieoczekiwany błąd podczas instalacji playwright: {str(e)}"
                 logger.error(error_msg)
@@ -337,8 +850,15 @@ class PlaywrightManager:
             self._report_progress(f"Błąd: {error_msg}")
             return False, error_msg
     
-    def _install_browsers(self, browsers=None):
-        """Instaluje wybrane przeglądarki."""
+    def _install_browsers(self, browsers=None, cmd_success: Optional[bool] = None):
+        """
+        Instaluje wybrane przeglądarki.
+        
+        Args:
+            browsers: Lista przeglądarek do instalacji (domyślnie tylko chromium)
+            cmd_success: Czy komenda `playwright` jest dostępna; None oznacza,
+                że trzeba to sprawdzić (dodatkowy proces)
+        """
         if browsers is None:
             browsers = ["chromium"]  # Domyślnie tylko Chromium
             
@@ -348,72 +868,111 @@ class PlaywrightManager:
         success = True
         messages = []
         
-        # Sprawdź czy mamy dostęp do komendy playwright
-        cmd_success, _ = self._check_playwright_command()
+        # Sprawdź czy mamy dostęp do komendy playwright (jeśli wywołujący jeszcze tego nie wie)
+        if cmd_success is None:
+            cmd_success, _ = self._check_playwright_command()
+        if cmd_success:
+            # Użyj standardowej komendy playwright install
+            install_cmd = ["playwright", "install"]
+        else:
+            # Użyj python -m playwright install
+            install_cmd = [sys.executable, "-m", "playwright", "install"]
         
-        for browser in browsers:
-            self._report_progress(f"Instalowanie przeglądarki {browser}...")
-            logger.info(f"Instalowanie przeglądarki {browser}...")
-            
-            try:
-                if cmd_success:
-                    # Użyj standardowej komendy playwright install
-                    cmd = ["playwright", "install", browser]
-                    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-                else:
-                    # Użyj python -m playwright install
-                    cmd = [sys.executable, "-m", "playwright", "install", browser]
-                    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-                
-                if result.returncode == 0:
-                    browser_msg = f"Przeglądarka {browser} została zainstalowana"
-                    messages.append(browser_msg)
-                    self._report_progress(browser_msg)
-                else:
-                    error_msg = f"Błąd instalacji przeglądarki {browser}: {result.stderr}"
-                    logger.error(error_msg)
-                    messages.append(error_msg)
-                    self._report_progress(f"Błąd: {error_msg}")
+        # Wszystkie przeglądarki jedną komendą (jeden start sterownika Playwright)
+        batch_done = False
+        if len(browsers) > 1:
+            batch_messages = []
+            batch_result = self._run_browser_install(install_cmd, browsers, batch_messages)
+            if batch_result is None:
+                return False, "Nie udało się zainstalować Playwright, co uniemożliwia instalację przeglądarek"
+            if batch_result:
+                messages.extend(batch_messages)
+                batch_done = True
+            else:
+                logger.warning("Zbiorcza instalacja przeglądarek nie powiodła się, instaluję je pojedynczo")
+        
+        # Instalacja pojedynczych przeglądarek (jedna przeglądarka lub błąd instalacji zbiorczej)
+        if not batch_done:
+            for browser in browsers:
+                browser_result = self._run_browser_install(install_cmd, [browser], messages)
+                if browser_result is None:
+                    return False, "Nie udało się zainstalować Playwright, co uniemożliwia instalację przeglądarek"
+                if not browser_result:
                     success = False
-                    
-                    # Dodatkowa informacja diagnostyczna
-                    logger.error(f"Komenda: {' '.join(cmd)}")
-                    logger.error(f"Kod wyjścia: {result.returncode}")
-                    logger.error(f"Wyjście standardowe: {result.stdout}")
-                    logger.error(f"Wyjście błędów: {result.stderr}")
-                    
-                    # Sprawdź czy pakiet jest dostępny mimo błędu
-                    if importlib.util.find_spec("playwright") is None:
-                        logger.error("Pakiet playwright nie jest dostępny, co uniemożliwia instalację przeglądarek")
-                        return False, "Nie udało się zainstalować Playwright, co uniemożliwia instalację przeglądarek"
-                    
-            except Exception as e:
-                error_msg = f"Nieoczekiwany błąd podczas instalacji przeglądarki {browser}: {str(e)}"
-                logger.error(error_msg)
-                messages.append(error_msg)
-                self._report_progress(f"Błąd: {error_msg}")
-                success = False
         
         # Odśwież status przeglądarek
-        self.installed_browsers = self._get_installed_browsers()
+        self._invalidate_status()
         
         if success:
             return True, "Przeglądarki zostały zainstalowane pomyślnie: " + "; ".join(messages)
         else:
             return False, "Wystąpiły błędy podczas instalacji przeglądarek: " + "; ".join(messages)
     
+    def _run_browser_install(self, install_cmd: List[str], browsers: List[str], messages: List[str]) -> Optional[bool]:
+        """
+        Uruchamia jedną komendę `playwright install` dla podanych przeglądarek.
+        
+        Args:
+            install_cmd: Początek komendy (bez nazw przeglądarek)
+            browsers: Lista przeglądarek do zainstalowania
+            messages: Lista, do której dopisywane są komunikaty wyniku
+            
+        Returns:
+            True przy powodzeniu, False przy błędzie, None gdy pakiet playwright jest niedostępny
+        """
+        label = ", ".join(browsers)
+        self._report_progress(f"Instalowanie przeglądarki {label}...")
+        logger.info(f"Instalowanie przeglądarki {label}...")
+        
+        cmd = install_cmd + list(browsers)
+        try:
+            result = self._run_streaming(cmd)
+            
+            if result.returncode == 0:
+                for browser in browsers:
+                    browser_msg = f"Przeglądarka {browser} została zainstalowana"
+                    messages.append(browser_msg)
+                    self._report_progress(browser_msg)
+                return True
+            
+            error_msg = f"Błąd instalacji przeglądarki {label}: {result.stderr}"
+            logger.error(error_msg)
+            messages.append(error_msg)
+            self._report_progress(f"Błąd: {error_msg}")
+            
+            # Dodatkowa informacja diagnostyczna
+            logger.error(f"Komenda: {' '.join(cmd)}")
+            logger.error(f"Kod wyjścia: {result.returncode}")
+            logger.error(f"Wyjście standardowe: {result.stdout}")
+            logger.error(f"Wyjście błędów: {result.stderr}")
+            
+            # Sprawdź czy pakiet jest dostępny mimo błędu
+            if importlib.util.find_spec("playwright") is None:
+                logger.error("Pakiet playwright nie jest dostępny, co uniemożliwia instalację przeglądarek")
+                return None
+            return False
+        
+        except subprocess.TimeoutExpired:
+            error_msg = f"Przekroczono limit czasu ({INSTALL_TIMEOUT} s) instalacji przeglądarki {label}"
+        except Exception as e:
+            error_msg = f"Nieoczekiwany błąd podczas instalacji przeglądarki {label}: {str(e)}"
+        
+        logger.error(error_msg)
+        messages.append(error_msg)
+        self._report_progress(f"Błąd: {error_msg}")
+        return False
+    
     def update_playwright(self):
         """Aktualizuje Playwright i przeglądarki do najnowszej wersji."""
         try:
             # Aktualizacja pakietu playwright
-            subprocess.run([sys.executable, '-m', 'pip', 'install', '--upgrade', 'playwright'], 
-                         check=True)
+            self._run_streaming([sys.executable, '-m', 'pip', 'install', '--upgrade', 'playwright'], check=True)
             
             # Aktualizacja przeglądarek
-            subprocess.run(['playwright', 'install', '--force'], check=True)
+            self._run_streaming(['playwright', 'install', '--force'], check=True)
             
             # Odśwież status instalacji
-            self.installed_browsers = self._get_installed_browsers()
+            self._invalidate_status()
             
             return True, "Playwright i przeglądarki zostały zaktualizowane pomyślnie."
             
@@ -421,6 +980,11 @@ class PlaywrightManager:
             error_msg = f"Błąd podczas aktualizacji: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
+        except subprocess.TimeoutExpired:
+            error_msg = f"Przekroczono limit czasu ({INSTALL_TIMEOUT} s) aktualizacji Playwright"
+            logger.error(error_msg)
+            self._report_progress(f"Błąd: {error_msg}")
+            return False, error_msg
         except Exception as e:
             error_msg = f"Niespodziewany błąd: {str(e)}"
             logger.error(error_msg)
@@ -443,33 +1007,36 @@ class PlaywrightManager:
             
             removed_browsers = []
             
-            # Usuwanie katalogów przeglądarek
+            # Katalogi do usunięcia: (przeglądarka, ścieżka)
+            browser_paths = []
             for browser in browsers:
-                browser_paths = []
-                
                 # Znajdź wszystkie wersje danej przeglądarki
                 try:
-                    cache_dir = Path.home() / ".cache" / "ms-playwright"
+                    cache_dir = self._default_cache
                     if cache_dir.exists():
-                        for item in cache_dir.iterdir():
-                            if item.is_dir() and item.name.lower().startswith(browser.lower()):
-                                browser_paths.append(item)
+                        with os.scandir(cache_dir) as it:
+                            for entry in it:
+                                if entry.is_dir(follow_symlinks=False) and entry.name.lower().startswith(browser.lower()):
+                                    browser_paths.append((browser, entry.path))
                 except Exception as e:
                     logger.error(f"Błąd podczas wyszukiwania ścieżek przeglądarki {browser}: {e}")
-                    continue
+            
+            # Usuń znalezione katalogi równolegle (każde drzewo to niezależne operacje I/O)
+            if browser_paths:
+                for _, path in browser_paths:
+                    logger.info(f"Usuwanie katalogu przeglądarki: {path}")
                 
-                # Usuń znalezione katalogi
-                for path in browser_paths:
-                    try:
-                        import shutil
-                        logger.info(f"Usuwanie katalogu przeglądarki: {path}")
-                        shutil.rmtree(path)
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(COPY_WORKERS, len(browser_paths))) as executor:
+                    errors = list(executor.map(_rmtree_quietly, [path for _, path in browser_paths]))
+                
+                for (browser, path), error in zip(browser_paths, errors):
+                    if error is None:
                         removed_browsers.append(browser)
-                    except Exception as e:
-                        logger.error(f"Błąd podczas usuwania katalogu {path}: {e}")
+                    else:
+                        logger.error(f"Błąd podczas usuwania katalogu {path}: {error}")
             
             # Aktualizuj status instalacji
-            self.installed_browsers = self._get_installed_browsers()
+            self._invalidate_status()
             
             if removed_browsers:
                 return True, f"Usunięto przeglądarki: {', '.join(set(removed_browsers))}"
@@ -493,13 +1060,14 @@ class PlaywrightManager:
         try:
             # Sprawdź aktualny stan instalacji
             status = self.get_installation_status()
+            self._invalidate_status()
             
             # Najpierw usuń wszystkie przeglądarki
             self._report_progress("Usuwanie wszystkich przeglądarek...")
             browser_success, browser_msg = self.uninstall_browsers()
             
             # Usuń katalog cache, jeśli istnieje
-            if os.path.exists(self.cache_dir):
+            if _is_dir(self.cache_dir):
                 self._report_progress("Usuwanie katalogu cache ms-playwright...")
                 try:
                     shutil.rmtree(self.cache_dir)
@@ -516,12 +1084,7 @@ class PlaywrightManager:
             self._report_progress("Usuwanie pakietu playwright...")
             try:
                 # Usuń pakiet playwright
-                subprocess.run(
-                    [sys.executable, "-m", "pip", "uninstall", "-y", "playwright"],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
+                self._run_streaming([sys.executable, "-m", "pip", "uninstall", "-y", "playwright"])
                 
                 # Sprawdź czy moduł został usunięty
                 spec = importlib.util.find_spec("playwright")
@@ -529,11 +1092,7 @@ class PlaywrightManager:
                     logger.warning("Pakiet playwright nadal jest wykrywalny mimo usunięcia")
                     
                     # Wyczyść z pamięci zaimportowane moduły jeśli były używane
-                    to_remove = [m for m in sys.modules if m.startswith('playwright')]
-                    for module_name in to_remove:
-                        if module_name in sys.modules:
-                            del sys.modules[module_name]
-                            logger.info(f"Usunięto z pamięci moduł: {module_name}")
+                    _purge_playwright_modules()
                 
                 # Dodatkowa weryfikacja po usunięciu
                 try:
@@ -544,6 +1103,11 @@ class PlaywrightManager:
                     logger.info("Pakiet playwright został pomyślnie usunięty")
                     return True, "Playwright został całkowicie usunięty"
                 
+            except subprocess.TimeoutExpired:
+                error_msg = f"Przekroczono limit czasu ({INSTALL_TIMEOUT} s) usuwania pakietu playwright"
+                logger.error(error_msg)
+                self._report_progress(f"Błąd: {error_msg}")
+                return False, error_msg
             except subprocess.CalledProcessError as e:
                 # Sprawdź czy błąd dotyczy braku pakietu
                 if "not installed" in str(e) or "as it is not installed" in str(e):
@@ -589,65 +1153,86 @@ class PlaywrightManager:
             return False, error_msg
     
     def _check_playwright_command(self) -> Tuple[bool, str]:
-        """Sprawdza, czy komenda playwright jest dostępna."""
+        """
+        Sprawdza, czy komenda playwright jest dostępna.
+        
+        Procesy są uruchamiane tylko wtedy, gdy komenda jest w PATH lub gdy
+        istnieje moduł playwright.__main__ (dla python -m playwright).
+        """
         try:
-            result = subprocess.run(
-                ["playwright", "--version"],
+            playwright_cmd = _cached_which("playwright")
+            if playwright_cmd is not None:
+                result = subprocess.run(
+                    [playwright_cmd, "--version"],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=PROBE_TIMEOUT
+                )
+                if result.returncode == 0:
+                    version = result.stdout.strip()
+                    logger.info(f"Komenda playwright działa, wersja: {version}")
+                    return True, version
+            
+            # Sprawdź, czy możemy uruchomić playwright poprzez python -m
+            if not _has_playwright() or importlib.util.find_spec("playwright.__main__") is None:
+                logger.warning("Komenda playwright nie jest dostępna")
+                return False, "nie zainstalowany"
+            
+            alt_result = subprocess.run(
+                [sys.executable, "-m", "playwright", "--version"],
                 capture_output=True,
                 text=True,
-                check=False
+                check=False,
+                timeout=PROBE_TIMEOUT
             )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                logger.info(f"Komenda playwright działa, wersja: {version}")
+            if alt_result.returncode == 0:
+                version = alt_result.stdout.strip()
+                logger.info(f"Komenda playwright działa przez python -m, wersja: {version}")
                 return True, version
             else:
-                # Sprawdź, czy możemy uruchomić playwright poprzez python -m
-                python_cmd = sys.executable
-                alt_result = subprocess.run(
-                    [python_cmd, "-m", "playwright", "--version"],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if alt_result.returncode == 0:
-                    version = alt_result.stdout.strip()
-                    logger.info(f"Komenda playwright działa przez python -m, wersja: {version}")
-                    return True, version
-                else:
-                    logger.warning("Komenda playwright nie działa")
-                    return False, "nie zainstalowany"
-        except FileNotFoundError:
-            # Sprawdź czy możemy uruchomić przez python -m
-            try:
-                python_cmd = sys.executable
-                alt_result = subprocess.run(
-                    [python_cmd, "-m", "playwright", "--version"],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if alt_result.returncode == 0:
-                    version = alt_result.stdout.strip()
-                    logger.info(f"Komenda playwright działa przez python -m, wersja: {version}")
-                    return True, version
-                else:
-                    logger.warning("Komenda playwright nie jest dostępna")
-                    return False, "nie zainstalowany"
-            except Exception as e:
-                logger.error(f"Błąd podczas sprawdzania komendy playwright przez python -m: {e}")
+                logger.warning("Komenda playwright nie działa")
                 return False, "nie zainstalowany"
+        except subprocess.TimeoutExpired as e:
+            logger.warning(f"Przekroczono limit czasu ({PROBE_TIMEOUT} s) komendy {' '.join(map(str, e.cmd))}")
+            return False, "nieznana"
         except Exception as e:
             logger.error(f"Błąd podczas sprawdzania komendy playwright: {e}")
             return False, "nieznana"
     
-    def _check_browser_installations(self) -> Dict[str, bool]:
-        """Sprawdza zainstalowane przeglądarki i próbuje naprawić ścieżki w środowisku PyInstaller."""
+    def _check_browser_installations(self, force: bool = False,
+                                     command_check: Optional[Callable[[], Tuple[bool, str]]] = None) -> Dict[str, bool]:
+        """
+        Sprawdza zainstalowane przeglądarki i próbuje naprawić ścieżki w środowisku PyInstaller.
+        
+        Wynik jest ponownie używany przez DIAGNOSTICS_TTL sekund, o ile nie zmienił się
+        czas modyfikacji katalogu cache ms-playwright.
+        
+        Args:
+            force: Wymusza pełną diagnostykę z pominięciem zapamiętanego wyniku
+            command_check: Zwraca (dostępna, wersja) komendy playwright - pozwala użyć
+                sprawdzenia wykonanego już przez wywołującego (domyślnie _check_playwright_command)
+        """
         browsers = {
             "chromium": False,
             "firefox": False,
             "webkit": False
         }
+        stat_cache = _StatCache()
+        
+        # Wynik niedawnej diagnostyki jest nadal aktualny, jeśli katalog cache się nie zmienił
+        try:
+            cache_mtime = os.stat(self.cache_dir).st_mtime_ns
+        except OSError:
+            cache_mtime = None
+        
+        if (not force
+                and self._browsers_cache is not None
+                and cache_mtime is not None
+                and cache_mtime == self._browsers_cache_mtime
+                and time.monotonic() - self._browsers_cache_time < DIAGNOSTICS_TTL):
+            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Używam wyniku ostatniej diagnostyki: {self._browsers_cache}")
+            return dict(self._browsers_cache)
         
         self._report_progress("🔍 DIAGNOSTYKA PRZEGLĄDAREK: Rozpoczynam szczegółowe sprawdzanie przeglądarek")
         
@@ -655,14 +1240,17 @@ class PlaywrightManager:
         is_frozen = getattr(sys, 'frozen', False)
         self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Aplikacja w trybie frozen/PyInstaller: {is_frozen}")
         
-        if is_frozen:
+        # Pomijamy diagnostykę PyInstaller, jeśli poprzednia zakończyła się powodzeniem.
+        # W trybie deweloperskim (nie-frozen) cały blok ścieżek aplikacji/_internal/AppData
+        # jest pomijany - dotyczy wyłącznie zbudowanej aplikacji.
+        if is_frozen and not self._last_diagnostics_ok:
             # Jesteśmy w środowisku PyInstaller, próbujemy naprawić ścieżki
             self._report_progress("🔍 DIAGNOSTYKA PRZEGLĄDAREK: Próbuję naprawić ścieżki w środowisku PyInstaller")
             
             # Zawsze próbuj naprawić ścieżki przy sprawdzaniu przeglądarek
             try:
                 self._report_progress("🔧 NAPRAWA: Sprawdzam i naprawiam ścieżki przeglądarek...")
-                fix_success = self.fix_executable_browser_path()
+                fix_success = self.fix_executable_browser_path(stat_cache=stat_cache)
                 if fix_success:
                     self._report_progress("✅ NAPRAWA: Ścieżki przeglądarek zostały naprawione")
                 else:
@@ -670,131 +1258,111 @@ class PlaywrightManager:
             except Exception as e:
                 self._report_progress(f"❌ NAPRAWA: Błąd podczas naprawiania ścieżek: {e}")
             
-            # Wypisz ścieżkę aplikacji
-            app_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka aplikacji: {app_path}")
-            
-            # Sprawdź ścieżki wewnątrz aplikacji
-            internal_path = os.path.join(app_path, "_internal")
-            playwright_path = os.path.join(internal_path, "playwright")
-            driver_path = os.path.join(playwright_path, "driver")
-            package_path = os.path.join(driver_path, "package")
-            local_browsers_path = os.path.join(package_path, ".local-browsers")
-            
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka _internal: {internal_path}, istnieje: {os.path.exists(internal_path)}")
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka playwright: {playwright_path}, istnieje: {os.path.exists(playwright_path)}")
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka driver: {driver_path}, istnieje: {os.path.exists(driver_path)}")
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka package: {package_path}, istnieje: {os.path.exists(package_path)}")
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka .local-browsers: {local_browsers_path}, istnieje: {os.path.exists(local_browsers_path)}")
-            
-            # Sprawdź plik browsers.json
-            browsers_json_path = os.path.join(package_path, "browsers.json")
-            if os.path.exists(browsers_json_path):
-                try:
-                    import json
-                    with open(browsers_json_path, 'r') as f:
-                        browsers_json = json.load(f)
-                    browser_revisions = {}
-                    for browser_info in browsers_json.get('browsers', []):
-                        if 'name' in browser_info and 'revision' in browser_info:
-                            browser_revisions[browser_info['name']] = browser_info['revision']
+            # Szczegółowe informacje o ścieżkach tylko w trybie pełnej diagnostyki
+            if self._verbose_diag:
+                with self._progress_buffer() as log:
+                    # Wynik sprawdzenia z fix_executable_browser_path, jeśli jest dostępny
+                    probe = self._last_probe or self._probe_pyinstaller_layout(stat_cache)
+                    pyinstaller_paths = probe.paths
                     
-                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Informacje o przeglądarkach z browsers.json: {browser_revisions}")
-                except Exception as e:
-                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd odczytu browsers.json: {str(e)}")
-            
-            # Sprawdź ścieżki do chrome.exe
-            expected_chrome_exe_paths = []
-            if os.path.exists(local_browsers_path):
-                try:
-                    browser_dirs = os.listdir(local_browsers_path)
-                    for browser_dir in browser_dirs:
-                        if browser_dir.startswith('chromium-'):
-                            chrome_win_dir = os.path.join(local_browsers_path, browser_dir, 'chrome-win')
-                            chrome_exe = os.path.join(chrome_win_dir, 'chrome.exe')
-                            expected_chrome_exe_paths.append({
-                                'path': chrome_exe,
-                                'exists': os.path.exists(chrome_exe),
-                                'size': os.path.getsize(chrome_exe) if os.path.exists(chrome_exe) else 0
-                            })
-                except Exception as e:
-                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania katalogów przeglądarek: {str(e)}")
-            
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Oczekiwane ścieżki chrome.exe: {expected_chrome_exe_paths}")
-            
-            # Sprawdź czy chrome.exe jest dostępny bezpośrednio w PATH
-            try:
-                chrome_in_path = shutil.which('chrome.exe') or shutil.which('chrome')
-                self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Chrome w PATH: {chrome_in_path}")
-            except Exception as e:
-                self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania chrome w PATH: {str(e)}")
+                    # Wypisz ścieżkę aplikacji
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka aplikacji: {pyinstaller_paths.base}")
+                    
+                    # Sprawdź ścieżki wewnątrz aplikacji
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka _internal: {pyinstaller_paths.internal}, istnieje: {probe.path_exists['internal']}")
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka playwright: {pyinstaller_paths.playwright}, istnieje: {probe.path_exists['playwright']}")
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka driver: {pyinstaller_paths.driver}, istnieje: {probe.path_exists['driver']}")
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka package: {pyinstaller_paths.package}, istnieje: {probe.path_exists['package']}")
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka .local-browsers: {pyinstaller_paths.local_browsers}, istnieje: {probe.path_exists['local_browsers']}")
+                    
+                    # Sprawdź plik browsers.json
+                    browsers_json_path = os.path.join(pyinstaller_paths.package, "browsers.json")
+                    if stat_cache.exists(browsers_json_path):
+                        try:
+                            with open(browsers_json_path, 'rb') as f:
+                                browser_revisions = _scan_browsers_json(f.read())
+                    
+                            log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Informacje o przeglądarkach z browsers.json: {browser_revisions}")
+                        except Exception as e:
+                            log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd odczytu browsers.json: {str(e)}")
+                    
+                    # Sprawdź ścieżki do chrome.exe
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Oczekiwane ścieżki chrome.exe: {probe.chrome_exe_paths}")
+                    
+                    # Sprawdź czy chrome.exe jest dostępny bezpośrednio w PATH
+                    try:
+                        chrome_in_path = _cached_which('chrome.exe') or _cached_which('chrome')
+                        log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Chrome w PATH: {chrome_in_path}")
+                    except Exception as e:
+                        log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania chrome w PATH: {str(e)}")
+                    
+                    # Sprawdź ścieżki w AppData
+                    try:
+                        appdata_local = self._localappdata
+                        appdata_playwright = os.path.join(appdata_local, 'ms-playwright')
+                        log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka AppData Playwright: {appdata_playwright}, istnieje: {stat_cache.exists(appdata_playwright)}")
+                    
+                        if stat_cache.exists(appdata_playwright):
+                            appdata_contents = os.listdir(appdata_playwright)
+                            log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Zawartość AppData Playwright: {appdata_contents}")
+                    except Exception as e:
+                        log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania AppData: {str(e)}")
+        
+        with self._progress_buffer() as log:
+            # Kontynuuj standardowe sprawdzanie przeglądarek
+            if not stat_cache.exists(self.cache_dir):
+                log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Katalog ms-playwright nie istnieje: {self.cache_dir}")
+            else:
+                log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Katalog ms-playwright istnieje: {self.cache_dir}")
             
-            # Sprawdź ścieżki w AppData
+            # Sprawdź na podstawie katalogów przeglądarek
             try:
-                appdata_local = os.environ.get('LOCALAPPDATA', '')
-                appdata_playwright = os.path.join(appdata_local, 'ms-playwright')
-                self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Ścieżka AppData Playwright: {appdata_playwright}, istnieje: {os.path.exists(appdata_playwright)}")
-                
-                if os.path.exists(appdata_playwright):
-                    appdata_contents = os.listdir(appdata_playwright)
-                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Zawartość AppData Playwright: {appdata_contents}")
-            except Exception as e:
-                self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania AppData: {str(e)}")
-        
-        # Kontynuuj standardowe sprawdzanie przeglądarek
-        if not os.path.exists(self.cache_dir):
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Katalog ms-playwright nie istnieje: {self.cache_dir}")
-        else:
-            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Katalog ms-playwright istnieje: {self.cache_dir}")
-        
-        # Sprawdź na podstawie katalogów przeglądarek
-        try:
-            if os.path.exists(self.cache_dir):
-                cache_contents = os.listdir(self.cache_dir)
-                self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Zawartość katalogu cache: {cache_contents}")
-                
-                for item in cache_contents:
-                    path = os.path.join(self.cache_dir, item)
-                    if os.path.isdir(path):
-                        item_name = item.lower()
-                        if item_name.startswith("chromium"):
-                            browsers["chromium"] = True
-                            self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono przeglądarkę chromium w katalogu cache: {path}")
+                if stat_cache.exists(self.cache_dir):
+                    with os.scandir(self.cache_dir) as cache_entries:
+                        cache_contents = list(cache_entries)
+                    log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Zawartość katalogu cache: {[entry.name for entry in cache_contents]}")
+                    
+                    for entry in cache_contents:
+                        # Typ wpisu pochodzi z odczytu katalogu - bez dodatkowego stat
+                        if entry.is_dir(follow_symlinks=False):
+                            path = entry.path
+                            item_name = entry.name.lower()
+                            if not item_name.startswith(_BROWSER_NAMES):
+                                continue
                             
-                            # Sprawdź czy chrome.exe istnieje w tym katalogu
-                            chrome_win_dir = os.path.join(path, 'chrome-win')
-                            chrome_exe = os.path.join(chrome_win_dir, 'chrome.exe')
-                            if os.path.exists(chrome_exe):
-                                self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono chrome.exe: {chrome_exe}, rozmiar: {os.path.getsize(chrome_exe)} bajtów")
-                            else:
-                                self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Nie znaleziono chrome.exe w {chrome_exe}")
-                                
-                                # Sprawdź zawartość katalogu
-                                if os.path.exists(chrome_win_dir):
-                                    try:
-                                        chrome_win_contents = os.listdir(chrome_win_dir)
-                                        self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Zawartość katalogu chrome-win: {chrome_win_contents}")
-                                    except Exception as e:
-                                        self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas listowania chrome-win: {str(e)}")
+                            browser = next(name for name in _BROWSER_NAMES if item_name.startswith(name))
+                            browsers[browser] = True
+                            log(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono przeglądarkę {browser} w katalogu cache: {path}")
+                            
+                            if browser == "chromium":
+                                # Sprawdź czy chrome.exe istnieje w tym katalogu
+                                chrome_win_dir = os.path.join(path, 'chrome-win')
+                                chrome_exe = os.path.join(chrome_win_dir, 'chrome.exe')
+                                if stat_cache.exists(chrome_exe):
+                                    log(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono chrome.exe: {chrome_exe}, rozmiar: {stat_cache.size(chrome_exe)} bajtów")
                                 else:
-                                    self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Katalog chrome-win nie istnieje: {chrome_win_dir}")
-                        elif item_name.startswith("firefox"):
-                            browsers["firefox"] = True
-                            self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono przeglądarkę firefox w katalogu cache: {path}")
-                        elif item_name.startswith("webkit"):
-                            browsers["webkit"] = True
-                            self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono przeglądarkę webkit w katalogu cache: {path}")
-            else:
-                self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Katalog cache {self.cache_dir} nie istnieje")
-        except Exception as e:
-            self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania katalogu ms-playwright: {str(e)}")
+                                    log(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Nie znaleziono chrome.exe w {chrome_exe}")
+                                
+                                    # Sprawdź zawartość katalogu
+                                    if stat_cache.exists(chrome_win_dir):
+                                        try:
+                                            chrome_win_contents = os.listdir(chrome_win_dir)
+                                            log(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Zawartość katalogu chrome-win: {chrome_win_contents}")
+                                        except Exception as e:
+                                            log(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas listowania chrome-win: {str(e)}")
+                                    else:
+                                        log(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Katalog chrome-win nie istnieje: {chrome_win_dir}")
+                else:
+                    log(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Katalog cache {self.cache_dir} nie istnieje")
+            except Exception as e:
+                log(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania katalogu ms-playwright: {str(e)}")
         
         # Sprawdź dodatkowo poprzez komendę dry-run, jeśli nie znaleziono przeglądarek
         if not any(browsers.values()):
             self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Nie znaleziono przeglądarek w katalogu cache, próbuję dry-run")
             try:
                 # Sprawdź czy komenda playwright jest dostępna
-                cmd_works, _ = self._check_playwright_command()
+                cmd_works, _ = (command_check or self._check_playwright_command)()
                 self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Komenda playwright jest dostępna: {cmd_works}")
                 
                 if cmd_works:
@@ -804,38 +1372,40 @@ class PlaywrightManager:
                     
                     result = subprocess.run(
                         dry_run_cmd, 
-                        capture_output=True, 
-                        text=True,
-                        check=False
+                        stdout=subprocess.PIPE, 
+                        stderr=subprocess.DEVNULL,
+                        check=False,
+                        timeout=DRY_RUN_TIMEOUT
                     )
+                    stdout = result.stdout.decode('utf-8', 'replace')
                     
                     self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Kod wyjścia dry-run: {result.returncode}")
-                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wyjście dry-run: {result.stdout}")
+                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wyjście dry-run: {stdout}")
                     
                     if result.returncode == 0:
-                        output = result.stdout.lower()
+                        output = stdout.lower()
                         
                         # Sprawdź informacje o przeglądarkach w outputcie
+                        install_locations = _parse_dry_run_output(output)
                         for browser in browsers.keys():
-                            if f"browser: {browser}" in output:
-                                # Sprawdź ścieżkę instalacji
-                                for line in output.split('\n'):
-                                    if "install location:" in line and browser in output.split('\n')[output.split('\n').index(line) - 1].lower():
-                                        install_path = line.strip().split("install location:")[1].strip()
-                                        self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wykryto ścieżkę dla {browser}: {install_path}")
-                                        
-                                        if install_path and os.path.exists(install_path):
-                                            browsers[browser] = True
-                                            self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Przeglądarka {browser} wykryta przez dry-run: {install_path}")
-                                            
-                                            # Sprawdź czy chrome.exe istnieje
-                                            if browser == "chromium":
-                                                chrome_win_dir = os.path.join(install_path, 'chrome-win')
-                                                chrome_exe = os.path.join(chrome_win_dir, 'chrome.exe')
-                                                if os.path.exists(chrome_exe):
-                                                    self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono chrome.exe przez dry-run: {chrome_exe}")
-                                                else:
-                                                    self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Nie znaleziono chrome.exe przez dry-run w {chrome_exe}")
+                            install_path = install_locations.get(browser)
+                            if install_path is None:
+                                continue
+                            
+                            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wykryto ścieżkę dla {browser}: {install_path}")
+                            
+                            if install_path and stat_cache.exists(install_path):
+                                browsers[browser] = True
+                                self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Przeglądarka {browser} wykryta przez dry-run: {install_path}")
+                                
+                                # Sprawdź czy chrome.exe istnieje
+                                if browser == "chromium":
+                                    chrome_win_dir = os.path.join(install_path, 'chrome-win')
+                                    chrome_exe = os.path.join(chrome_win_dir, 'chrome.exe')
+                                    if stat_cache.exists(chrome_exe):
+                                        self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Znaleziono chrome.exe przez dry-run: {chrome_exe}")
+                                    else:
+                                        self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Nie znaleziono chrome.exe przez dry-run w {chrome_exe}")
                 else:
                     # Spróbuj przez python -m
                     dry_run_cmd = [sys.executable, "-m", "playwright", "install", "--dry-run"]
@@ -843,58 +1413,62 @@ class PlaywrightManager:
                     
                     result = subprocess.run(
                         dry_run_cmd, 
-                        capture_output=True, 
-                        text=True,
-                        check=False
+                        stdout=subprocess.PIPE, 
+                        stderr=subprocess.DEVNULL,
+                        check=False,
+                        timeout=DRY_RUN_TIMEOUT
                     )
+                    stdout = result.stdout.decode('utf-8', 'replace')
                     
                     self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Kod wyjścia python -m dry-run: {result.returncode}")
-                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wyjście python -m dry-run: {result.stdout}")
+                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wyjście python -m dry-run: {stdout}")
                     
                     if result.returncode == 0:
-                        output = result.stdout.lower()
+                        output = stdout.lower()
                         
                         # Sprawdź informacje o przeglądarkach w outputcie
+                        install_locations = _parse_dry_run_output(output)
                         for browser in browsers.keys():
-                            if f"browser: {browser}" in output:
-                                # Sprawdź ścieżkę instalacji
-                                for line in output.split('\n'):
-                                    if "install location:" in line and browser in output.split('\n')[output.split('\n').index(line) - 1].lower():
-                                        install_path = line.strip().split("install location:")[1].strip()
-                                        self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wykryto ścieżkę dla {browser} przez python -m: {install_path}")
-                                        
-                                        if install_path and os.path.exists(install_path):
-                                            browsers[browser] = True
-                                            self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Przeglądarka {browser} wykryta przez python -m dry-run: {install_path}")
+                            install_path = install_locations.get(browser)
+                            if install_path is None:
+                                continue
+                            
+                            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wykryto ścieżkę dla {browser} przez python -m: {install_path}")
+                            
+                            if install_path and stat_cache.exists(install_path):
+                                browsers[browser] = True
+                                self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Przeglądarka {browser} wykryta przez python -m dry-run: {install_path}")
+            except subprocess.TimeoutExpired:
+                self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Przekroczono limit czasu ({DRY_RUN_TIMEOUT} s) komendy dry-run")
             except Exception as e:
                 self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas sprawdzania przeglądarek przez dry-run: {str(e)}")
         
-        # Sprawdź systemowe ścieżki przeglądarek dla dodatkowej weryfikacji
-        system_browser_paths = self._get_browser_paths_from_system()
-        self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Systemowe ścieżki przeglądarek: {system_browser_paths}")
-        
         # Jeśli nadal nie znaleziono chromium, spróbuj użyć systemowej przeglądarki
         if not browsers["chromium"] and is_frozen:
+            # Sprawdź systemowe ścieżki przeglądarek dla dodatkowej weryfikacji
+            system_browser_paths = self._get_browser_paths_from_system()
+            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Systemowe ścieżki przeglądarek: {system_browser_paths}")
+            
             if "chromium" in system_browser_paths or "chromium_appdata" in system_browser_paths or "chrome_system" in system_browser_paths:
                 self._report_progress("🔍 DIAGNOSTYKA PRZEGLĄDAREK: Nie znaleziono chromium w aplikacji, próbuję użyć systemowej przeglądarki")
                 
                 if "chromium" in system_browser_paths:
                     browsers["chromium"] = True
                     chromium_path = system_browser_paths["chromium"]
-                    chromium_parent = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(chromium_path))))
+                    chromium_parent = _ascend(chromium_path, 4)
                     os.environ["PLAYWRIGHT_BROWSERS_PATH"] = chromium_parent
                     self._report_progress(f"✅ DIAGNOSTYKA PRZEGLĄDAREK: Użyto systemowego Chromium: {chromium_path}, PLAYWRIGHT_BROWSERS_PATH={chromium_parent}")
                 elif "chromium_appdata" in system_browser_paths:
                     # Alternatywnie, użyj ścieżki z AppData
+                    browsers["chromium"] = True
                     chromium_path = system_browser_paths["chromium_appdata"]
                     # Poprawka - wskazujemy na katalog ms-playwright w AppData, a nie na cały AppData\Local
                     # Ścieżka zawiera: AppData\Local\ms-playwright\chromium-XXXX\chrome-win\chrome.exe
                     # Potrzebujemy wskazać na: AppData\Local\ms-playwright
-                    chromium_parent = os.path.dirname(os.path.dirname(os.path.dirname(chromium_path)))
+                    chromium_parent = _ascend(chromium_path, 3)
                     
                     self._report_progress(f"🔧 NAPRAWA: Ustawiam PLAYWRIGHT_BROWSERS_PATH={chromium_parent} (z AppData)")
                     os.environ["PLAYWRIGHT_BROWSERS_PATH"] = chromium_parent
-                    return True
                 elif "chrome_system" in system_browser_paths:
                     browsers["chromium"] = True
                     chrome_path = system_browser_paths["chrome_system"]
@@ -904,38 +1478,107 @@ class PlaywrightManager:
         # Podsumowanie
         self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Podsumowanie wykrytych przeglądarek: {browsers}")
         
-        # Spróbuj użyć playwright API do sprawdzenia przeglądarek
+        # Spróbuj użyć playwright API do sprawdzenia przeglądarek (tylko gdy czegoś brakuje)
         try:
-            import importlib
-            if importlib.util.find_spec("playwright") is not None:
+            if self._verbose_diag and not all(browsers.values()) and _has_playwright():
                 self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Sprawdzam przeglądarki przez Playwright API")
                 
                 try:
-                    from playwright.sync_api import sync_playwright
-                    with sync_playwright() as p:
-                        # Sprawdź czy API chromium jest dostępne
-                        has_chromium = hasattr(p, 'chromium')
-                        self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Playwright API ma dostęp do chromium: {has_chromium}")
-                        
-                        # Spróbuj pobrać listę przeglądarek przez API
-                        try:
-                            browser_types = [name for name in dir(p) if not name.startswith('_') and name in ['chromium', 'firefox', 'webkit']]
-                            self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wykryte typy przeglądarek przez API: {browser_types}")
-                        except Exception as e:
-                            self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas pobierania typów przeglądarek: {str(e)}")
+                    # Typy przeglądarek są atrybutami klasy Playwright - nie trzeba
+                    # uruchamiać sync_playwright() (i procesu sterownika Node)
+                    import playwright.sync_api as playwright_sync_api
+                    playwright_cls = playwright_sync_api.Playwright
+                    
+                    # Sprawdź czy API chromium jest dostępne
+                    has_chromium = hasattr(playwright_cls, 'chromium')
+                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Playwright API ma dostęp do chromium: {has_chromium}")
+                    
+                    browser_types = [name for name in ('chromium', 'firefox', 'webkit') if hasattr(playwright_cls, name)]
+                    self._report_progress(f"🔍 DIAGNOSTYKA PRZEGLĄDAREK: Wykryte typy przeglądarek przez API: {browser_types}")
                 except Exception as e:
                     self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas inicjalizacji Playwright API: {str(e)}")
         except Exception as e:
             self._report_progress(f"❌ DIAGNOSTYKA PRZEGLĄDAREK: Błąd podczas importu playwright: {str(e)}")
         
+        self._browsers_cache = dict(browsers)
+        self._browsers_cache_mtime = cache_mtime
+        self._browsers_cache_time = time.monotonic()
+        self._last_diagnostics_ok = any(browsers.values())
+        
         return browsers
 
-    def fix_executable_browser_path(self):
+    def _probe_pyinstaller_layout(self, stat_cache) -> _PyInstallerProbe:
+        """
+        Jednorazowo sprawdza katalogi wbudowanego Playwright i pliki chrome.exe.
+        
+        Wynik jest zapisywany w self._last_probe, aby diagnostyka nie powtarzała
+        sprawdzeń wykonanych już przez fix_executable_browser_path.
+        
+        Args:
+            stat_cache: _StatCache bieżącego wywołania
+        """
+        paths = self._pyinstaller_paths
+        path_exists = {
+            name: stat_cache.exists(getattr(paths, name))
+            for name in ("internal", "playwright", "driver", "package", "local_browsers")
+        }
+        try:
+            chrome_exe_paths = self._probe_tree(paths.local_browsers)
+        except OSError:
+            chrome_exe_paths = []
+        
+        self._last_probe = _PyInstallerProbe(paths, path_exists, chrome_exe_paths)
+        return self._last_probe
+    
+    @staticmethod
+    def _probe_tree(local_browsers_path):
+        """
+        Zbiera informacje o chrome.exe we wszystkich katalogach chromium-* jednym przejściem os.scandir.
+        
+        Args:
+            local_browsers_path: Ścieżka do katalogu .local-browsers
+            
+        Returns:
+            list: Lista słowników z kluczami 'path', 'exists' i 'size'
+            
+        Raises:
+            FileNotFoundError: Jeśli katalog local_browsers_path nie istnieje
+        """
+        chrome_exe_paths = []
+        with os.scandir(local_browsers_path) as browser_entries:
+            for browser_entry in browser_entries:
+                if not browser_entry.name.startswith('chromium-'):
+                    continue
+                
+                chrome_win_dir = os.path.join(browser_entry.path, 'chrome-win')
+                chrome_exe_info = {
+                    'path': os.path.join(chrome_win_dir, 'chrome.exe'),
+                    'exists': False,
+                    'size': 0
+                }
+                try:
+                    with os.scandir(chrome_win_dir) as chrome_win_entries:
+                        for chrome_win_entry in chrome_win_entries:
+                            if chrome_win_entry.name == 'chrome.exe':
+                                chrome_exe_info['exists'] = True
+                                chrome_exe_info['size'] = chrome_win_entry.stat().st_size
+                                break
+                except OSError:
+                    pass
+                chrome_exe_paths.append(chrome_exe_info)
+        return chrome_exe_paths
+
+    def fix_executable_browser_path(self, stat_cache=None):
         """
         Naprawia ścieżki do przeglądarek w środowisku PyInstaller.
         Ta metoda jest używana, gdy aplikacja jest uruchomiona jako plik wykonywalny.
+        
+        Args:
+            stat_cache: Opcjonalny _StatCache współdzielony z wywołującą diagnostyką
         """
         self._report_progress("Sprawdzanie i naprawianie ścieżek przeglądarek w środowisku wykonywalnym...")
+        if stat_cache is None:
+            stat_cache = _StatCache()
         
         try:
             # Dokładne sprawdzenie wszystkich ścieżek
@@ -951,7 +1594,8 @@ class PlaywrightManager:
                 return
             
             # Ustal bazową ścieżkę do katalogu z wbudowanym Playwright
-            base_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+            pyinstaller_paths = self._pyinstaller_paths
+            base_path = pyinstaller_paths.base
             self._report_progress(f"🔍 DIAGNOSTYKA: Ścieżka bazowa aplikacji: {base_path}")
             
             # KOREKCJA: problem podwójnego _internal
@@ -960,55 +1604,40 @@ class PlaywrightManager:
             # Prawidłowo wykrywamy i naprawiamy ten problem
             
             # 1. Sprawdź, czy _internal występuje już w ścieżce bazowej
-            if base_path.endswith('_internal'):
+            internal_path = pyinstaller_paths.internal
+            if internal_path == base_path:
                 # Jeśli ścieżka już kończy się na _internal, nie dodawaj tego ponownie
-                internal_path = base_path
                 self._report_progress(f"🔍 DIAGNOSTYKA: Ścieżka bazowa już zawiera _internal, używam bezpośrednio: {internal_path}")
             else:
                 # Normalny przypadek - dodaj _internal do ścieżki bazowej
-                internal_path = os.path.join(base_path, "_internal")
                 self._report_progress(f"🔍 DIAGNOSTYKA: Dodaję _internal do ścieżki bazowej: {internal_path}")
             
-            # 2. Budujemy i sprawdzamy wszystkie możliwe ścieżki
-            playwright_path = os.path.join(internal_path, "playwright")
-            driver_path = os.path.join(playwright_path, "driver")
-            package_path = os.path.join(driver_path, "package")
-            local_browsers_path = os.path.join(package_path, ".local-browsers")
-            
-            # Sprawdź i wypisz wszystkie ścieżki
-            paths = {
-                "internal_path": internal_path,
-                "playwright_path": playwright_path,
-                "driver_path": driver_path,
-                "package_path": package_path,
-                "local_browsers_path": local_browsers_path
-            }
-            
-            for name, path in paths.items():
-                exists = os.path.exists(path)
-                self._report_progress(f"🔍 DIAGNOSTYKA: Ścieżka {name}: {path}, istnieje: {exists}")
+            # 2. Budujemy i sprawdzamy wszystkie możliwe ścieżki (wynik jest też używany przez diagnostykę)
+            probe = self._probe_pyinstaller_layout(stat_cache)
+            
+            with self._progress_buffer() as log:
+                # Sprawdź i wypisz wszystkie ścieżki
+                for name, exists in probe.path_exists.items():
+                    path = getattr(pyinstaller_paths, name)
+                    log(f"🔍 DIAGNOSTYKA: Ścieżka {name}_path: {path}, istnieje: {exists}")
                 
-                # Jeśli katalog istnieje, sprawdź jego zawartość
-                if exists and os.path.isdir(path):
-                    try:
-                        contents = os.listdir(path)
-                        self._report_progress(f"🔍 DIAGNOSTYKA: Zawartość {name}: {contents}")
-                    except Exception as e:
-                        self._report_progress(f"🔍 DIAGNOSTYKA: Błąd listowania {name}: {e}")
+                    # Jeśli katalog istnieje, sprawdź jego zawartość
+                    if exists and stat_cache.isdir(path):
+                        try:
+                            contents = os.listdir(path)
+                            log(f"🔍 DIAGNOSTYKA: Zawartość {name}: {contents}")
+                        except Exception as e:
+                            log(f"🔍 DIAGNOSTYKA: Błąd listowania {name}: {e}")
             
             # 3. Sprawdź konkretne ścieżki przeglądarek
-            if os.path.exists(local_browsers_path):
-                for browser_dir in os.listdir(local_browsers_path):
-                    if browser_dir.startswith('chromium-'):
-                        chrome_win_dir = os.path.join(local_browsers_path, browser_dir, 'chrome-win')
-                        chrome_exe = os.path.join(chrome_win_dir, 'chrome.exe')
-                        
-                        if os.path.exists(chrome_exe):
-                            self._report_progress(f"✅ DIAGNOSTYKA: Znaleziono chrome.exe: {chrome_exe}")
-                            # Wszystko wygląda prawidłowo, po prostu zwróć True
-                            return True
-                        else:
-                            self._report_progress(f"❌ DIAGNOSTYKA: Nie znaleziono chrome.exe w oczekiwanej lokalizacji: {chrome_exe}")
+            for chrome_exe_info in probe.chrome_exe_paths:
+                chrome_exe = chrome_exe_info['path']
+                if chrome_exe_info['exists']:
+                    self._report_progress(f"✅ DIAGNOSTYKA: Znaleziono chrome.exe: {chrome_exe}")
+                    # Wszystko wygląda prawidłowo, po prostu zwróć True
+                    return True
+                else:
+                    self._report_progress(f"❌ DIAGNOSTYKA: Nie znaleziono chrome.exe w oczekiwanej lokalizacji: {chrome_exe}")
             
             # 4. Jeśli nie znaleziono żadnej przeglądarki w aplikacji, musimy podjąć działania naprawcze
             self._report_progress("🔧 NAPRAWA: Brak przeglądarek w aplikacji, próbuję znaleźć alternatywne rozwiązania...")
@@ -1030,7 +1659,7 @@ class PlaywrightManager:
                 # Potrzebujemy wskazać na katalog ms-playwright w .cache, a nie na całe .cache
                 # Ścieżka zawiera: .cache\ms-playwright\chromium-XXXX\chrome-win\chrome.exe
                 # Potrzebujemy wskazać na: .cache\ms-playwright
-                chromium_parent = os.path.dirname(os.path.dirname(os.path.dirname(chromium_path)))
+                chromium_parent = _ascend(chromium_path, 3)
                 
                 # Ustaw zmienną środowiskową 
                 self._report_progress(f"🔧 NAPRAWA: Ustawiam PLAYWRIGHT_BROWSERS_PATH={chromium_parent}")
@@ -1042,7 +1671,7 @@ class PlaywrightManager:
                 # Poprawka - wskazujemy na katalog ms-playwright w AppData, a nie na cały AppData\Local
                 # Ścieżka zawiera: AppData\Local\ms-playwright\chromium-XXXX\chrome-win\chrome.exe
                 # Potrzebujemy wskazać na: AppData\Local\ms-playwright
-                chromium_parent = os.path.dirname(os.path.dirname(os.path.dirname(chromium_path)))
+                chromium_parent = _ascend(chromium_path, 3)
                 
                 self._report_progress(f"🔧 NAPRAWA: Ustawiam PLAYWRIGHT_BROWSERS_PATH={chromium_parent} (z AppData)")
                 os.environ["PLAYWRIGHT_BROWSERS_PATH"] = chromium_parent
@@ -1056,9 +1685,9 @@ class PlaywrightManager:
                 
                 # Stwórz tymczasowy katalog z plikiem przekierowania
                 import tempfile
-                import json
                 temp_dir = os.path.join(tempfile.gettempdir(), "ms-playwright-redirect")
                 os.makedirs(temp_dir, exist_ok=True)
+                stat_cache.invalidate(temp_dir)
                 
                 # Utwórz plik wskazujący na Chrome
                 chrome_json = os.path.join(temp_dir, "chrome_system.json")
@@ -1083,8 +1712,7 @@ class PlaywrightManager:
             
             # Sprawdź, czy w ogóle playwright jest zainstalowany
             try:
-                import importlib
-                has_playwright = importlib.util.find_spec("playwright") is not None
+                has_playwright = _has_playwright()
                 self._report_progress(f"🔧 DIAGNOSTYKA: Moduł playwright jest dostępny: {has_playwright}")
                 
                 if has_playwright:
@@ -1120,7 +1748,7 @@ class PlaywrightManager:
                     # Poprawka - wskazujemy na katalog ms-playwright w .cache, a nie na całe .cache
                     # Ścieżka zawiera: .cache\ms-playwright\chromium-XXXX\chrome-win\chrome.exe
                     # Potrzebujemy wskazać na: .cache\ms-playwright
-                    chromium_parent = os.path.dirname(os.path.dirname(os.path.dirname(chromium_path)))
+                    chromium_parent = _ascend(chromium_path, 3)
                     self._report_progress(f"🔧 NAPRAWA AWARYJNA: Ustawiam PLAYWRIGHT_BROWSERS_PATH={chromium_parent}")
                     os.environ["PLAYWRIGHT_BROWSERS_PATH"] = chromium_parent
                     return True
@@ -1143,6 +1771,11 @@ class PlaywrightManager:
         Returns:
             bool: True, jeśli konfiguracja się powiodła, False w przeciwnym przypadku.
         """
+        # Konfiguracja już się powiodła dla bieżących zmiennych środowiskowych
+        if self._configured_result is not None and self._configured_env_hash == self._configuration_env_hash():
+            self._report_progress("Ścieżki Playwright są już skonfigurowane")
+            return self._configured_result
+        
         self._report_progress("Konfiguracja ścieżek Playwright przy starcie aplikacji...")
         
         try:
@@ -1152,7 +1785,10 @@ class PlaywrightManager:
             if is_frozen:
                 # Używamy specjalnej metody dla środowiska PyInstaller
                 self._report_progress("Wykryto środowisko PyInstaller, używam dedykowanej metody naprawy ścieżek")
-                return self.fix_executable_browser_path()
+                result = self.fix_executable_browser_path()
+                if result:
+                    self._remember_configuration(result)
+                return result
             else:
                 # W normalnym środowisku sprawdzamy, czy mamy dostęp do przeglądarek
                 self._report_progress("Standardowe środowisko Python, sprawdzam dostępność przeglądarek")
@@ -1170,81 +1806,124 @@ class PlaywrightManager:
                 
                 # Wszystko wygląda dobrze w standardowym środowisku
                 self._report_progress("✅ Playwright i przeglądarki są poprawnie skonfigurowane")
+                self._remember_configuration(True)
                 return True
         
         except Exception as e:
             self._report_progress(f"❌ Błąd podczas konfiguracji ścieżek Playwright: {e}")
             return False
+    
+    @staticmethod
+    def _configuration_env_hash() -> int:
+        """Odcisk zmiennych środowiskowych, od których zależy konfiguracja ścieżek."""
+        return hash((
+            os.environ.get('PLAYWRIGHT_BROWSERS_PATH'),
+            os.environ.get('PLAYWRIGHT_CHROMIUM_EXECUTABLE'),
+            getattr(sys, 'frozen', False)
+        ))
+    
+    def _remember_configuration(self, result: bool):
+        """Zapamiętuje udaną konfigurację dla środowiska ustawionego przez nią samą."""
+        self._configured_result = result
+        self._configured_env_hash = self._configuration_env_hash()
+    
+    def invalidate_configuration_cache(self):
+        """Wymusza pełną konfigurację ścieżek przy następnym wywołaniu configure_playwright_paths."""
+        self._configured_result = None
+        self._configured_env_hash = None
 
     def _get_browser_paths_from_system(self):
-        """Zwraca ścieżki przeglądarek z systemu."""
+        """
+        Zwraca ścieżki przeglądarek z systemu.
+        
+        Wynik jest zapamiętywany na czas życia obiektu i liczony ponownie
+        dopiero po zmianie PLAYWRIGHT_BROWSERS_PATH lub czasu modyfikacji
+        któregoś z przeszukiwanych katalogów ms-playwright.
+        """
+        roots = [self._default_cache]
+        if os.name == 'nt':
+            roots.append(Path(self._localappdata) / "ms-playwright")
+        
+        root_mtimes = []
+        for root in roots:
+            try:
+                root_mtimes.append(os.stat(root).st_mtime_ns)
+            except OSError:
+                root_mtimes.append(0)
+        
+        env_sig = (os.environ.get("PLAYWRIGHT_BROWSERS_PATH"), tuple(root_mtimes))
+        if self._sys_paths_cache is not None and env_sig == self._sys_paths_env_sig:
+            return dict(self._sys_paths_cache)
+        
+        browser_paths = self._scan_browser_paths_from_system()
+        self._sys_paths_cache = dict(browser_paths)
+        self._sys_paths_env_sig = env_sig
+        return browser_paths
+    
+    def _scan_ms_playwright(self, root, key_suffix: str, location: str) -> Dict[str, str]:
+        """
+        Przeszukuje jeden katalog ms-playwright w poszukiwaniu plików wykonywalnych przeglądarek.
+        
+        Args:
+            root: Katalog ms-playwright
+            key_suffix: Przyrostek dodawany do nazwy przeglądarki w wyniku (np. "_appdata")
+            location: Opis lokalizacji używany w komunikatach
+            
+        Returns:
+            dict: Słownik {nazwa przeglądarki + przyrostek: ścieżka pliku wykonywalnego}
+        """
+        browser_paths = {}
+        try:
+            with os.scandir(root) as it:
+                # Filtr po nazwie przed is_dir - pozostałe wpisy nie są w ogóle sprawdzane
+                entries = [entry for entry in it if entry.name.startswith(_BROWSER_DIR_PREFIXES) and entry.is_dir()]
+        except FileNotFoundError:
+            return browser_paths
+        
+        for entry in entries:
+            browser = entry.name.split("-", 1)[0]
+            
+            # Znana ścieżka pliku wykonywalnego sprawdzana jednym stat, bez listowania podkatalogów
+            exe_path = os.path.join(entry.path, *_SYSTEM_BROWSER_EXECUTABLES[browser])
+            try:
+                is_file = stat.S_ISREG(os.stat(exe_path).st_mode)
+            except OSError:
+                is_file = False
+            
+            if is_file:
+                browser_paths[browser + key_suffix] = exe_path
+                if browser == "chromium":
+                    self._report_progress(f"📁 Znaleziono chrome.exe {location}: {exe_path}")
+            elif browser == "chromium":
+                self._report_progress(f"⚠️ Nie znaleziono chrome.exe {location}: {exe_path}")
+        
+        return browser_paths
+    
+    def _scan_browser_paths_from_system(self):
+        """Przeszukuje system w poszukiwaniu ścieżek przeglądarek."""
         browser_paths = {}
         
         try:
             # Standardowa ścieżka cache Playwright
-            cache_dir = Path.home() / ".cache" / "ms-playwright"
-            if cache_dir.exists():
-                for item in os.listdir(cache_dir):
-                    if item.startswith("chromium-"):
-                        chrome_win_dir = os.path.join(cache_dir, item, "chrome-win")
-                        chrome_exe = os.path.join(chrome_win_dir, "chrome.exe")
-                        if os.path.exists(chrome_exe):
-                            browser_paths["chromium"] = str(chrome_exe)
-                            self._report_progress(f"📁 Znaleziono chrome.exe w systemowym cache: {chrome_exe}")
-                        else:
-                            self._report_progress(f"⚠️ Nie znaleziono chrome.exe w oczekiwanej ścieżce: {chrome_exe}")
-                    elif item.startswith("firefox-"):
-                        if os.name == 'nt':
-                            firefox_exe = os.path.join(cache_dir, item, "firefox", "firefox.exe")
-                        else:
-                            firefox_exe = os.path.join(cache_dir, item, "firefox", "firefox")
-                        if os.path.exists(firefox_exe):
-                            browser_paths["firefox"] = str(firefox_exe)
-                    elif item.startswith("webkit-"):
-                        if os.name == 'nt':
-                            webkit_exe = os.path.join(cache_dir, item, "minibrowser", "MiniBrowser.exe")
-                        else:
-                            webkit_exe = os.path.join(cache_dir, item, "minibrowser", "MiniBrowser")
-                        if os.path.exists(webkit_exe):
-                            browser_paths["webkit"] = str(webkit_exe)
+            cache_dir = self._default_cache
+            browser_paths.update(self._scan_ms_playwright(cache_dir, "", "w systemowym cache"))
             
             # Ścieżka w AppData dla Windows
             if os.name == 'nt':
-                appdata_path = Path(os.environ.get('LOCALAPPDATA', '')) / "ms-playwright"
-                if appdata_path.exists():
-                    for item in os.listdir(appdata_path):
-                        if item.startswith("chromium-"):
-                            chrome_win_dir = os.path.join(appdata_path, item, "chrome-win")
-                            chrome_exe = os.path.join(chrome_win_dir, "chrome.exe")
-                            if os.path.exists(chrome_exe):
-                                browser_paths["chromium_appdata"] = str(chrome_exe)
-                                self._report_progress(f"📁 Znaleziono chrome.exe w AppData: {chrome_exe}")
-                            else:
-                                self._report_progress(f"⚠️ Nie znaleziono chrome.exe w AppData: {chrome_exe}")
-                        elif item.startswith("firefox-"):
-                            firefox_exe = os.path.join(appdata_path, item, "firefox", "firefox.exe")
-                            if os.path.exists(firefox_exe):
-                                browser_paths["firefox_appdata"] = str(firefox_exe)
-                        elif item.startswith("webkit-"):
-                            webkit_exe = os.path.join(appdata_path, item, "minibrowser", "MiniBrowser.exe")
-                            if os.path.exists(webkit_exe):
-                                browser_paths["webkit_appdata"] = str(webkit_exe)
+                appdata_path = Path(self._localappdata) / "ms-playwright"
+                browser_paths.update(self._scan_ms_playwright(appdata_path, "_appdata", "w AppData"))
             
             # Sprawdź również instalację Chromium poza Playwright
             try:
                 # Sprawdź systemową przeglądarkę Chrome
                 if os.name == 'nt':
                     # Standardowe lokalizacje na Windows
-                    program_files = os.environ.get('PROGRAMFILES', 'C:\\Program Files')
-                    program_files_x86 = os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')
-                    chrome_locations = [
-                        os.path.join(program_files, "Google", "Chrome", "Application", "chrome.exe"),
-                        os.path.join(program_files_x86, "Google", "Chrome", "Application", "chrome.exe"),
-                        os.path.join(os.environ.get('LOCALAPPDATA', ''), "Google", "Chrome", "Application", "chrome.exe")
-                    ]
+                    chrome_locations = _system_chrome_candidates(
+                        self._programfiles, self._programfiles_x86, self._localappdata
+                    )
                     
                     for location in chrome_locations:
-                        if os.path.exists(location):
+                        if os.path.isfile(location):
                             browser_paths["chrome_system"] = location
                             self._report_progress(f"📁 Znaleziono systemowy Chrome: {location}")
                             break
@@ -1269,169 +1948,59 @@ class PlaywrightManager:
                 self._report_progress("📋 OPERACJA KOPIOWANIA: Nie jesteśmy w środowisku PyInstaller, pomijam")
                 return False
             
-            # Ustal ścieżkę docelową w aplikacji
-            app_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+            # Ustal ścieżkę docelową w aplikacji (wyliczoną raz na obiekt)
+            app_path = self._pyinstaller_paths.base
+            internal_path = self._pyinstaller_paths.internal
             
             # Sprawdź, czy _internal występuje już w ścieżce
-            if app_path.endswith('_internal'):
-                internal_path = app_path
+            if internal_path == app_path:
                 self._report_progress(f"📋 OPERACJA KOPIOWANIA: Ścieżka już zawiera _internal: {internal_path}")
             else:
-                internal_path = os.path.join(app_path, "_internal")
                 self._report_progress(f"📋 OPERACJA KOPIOWANIA: Dodaję _internal do ścieżki: {internal_path}")
             
-            # Możliwe ścieżki dla katalogu przeglądarek
-            possible_target_paths = []
-            
-            # Standardowa struktura katalogów
-            playwright_path = os.path.join(internal_path, "playwright")
-            driver_path = os.path.join(playwright_path, "driver")
-            package_path = os.path.join(driver_path, "package")
-            target_browsers_path = os.path.join(package_path, ".local-browsers")
-            possible_target_paths.append(target_browsers_path)
-            
-            # Alternatywna struktura (bez katalogu _internal)
-            alt_playwright_path = os.path.join(app_path, "playwright")
-            alt_driver_path = os.path.join(alt_playwright_path, "driver")
-            alt_package_path = os.path.join(alt_driver_path, "package")
-            alt_target_browsers_path = os.path.join(alt_package_path, ".local-browsers")
-            possible_target_paths.append(alt_target_browsers_path)
-            
-            # Alternatywna struktura (z podwójnym _internal)
-            alt2_internal_path = os.path.join(internal_path, "_internal")
-            alt2_playwright_path = os.path.join(alt2_internal_path, "playwright")
-            alt2_driver_path = os.path.join(alt2_playwright_path, "driver")
-            alt2_package_path = os.path.join(alt2_driver_path, "package")
-            alt2_target_browsers_path = os.path.join(alt2_package_path, ".local-browsers")
-            possible_target_paths.append(alt2_target_browsers_path)
-            
-            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Sprawdzam możliwe ścieżki docelowe: {possible_target_paths}")
-            
-            # Znajdź pierwszą istniejącą ścieżkę docelową
-            target_browsers_path = None
-            for path in possible_target_paths:
-                if os.path.exists(os.path.dirname(path)):
-                    target_browsers_path = path
-                    self._report_progress(f"📋 OPERACJA KOPIOWANIA: Znaleziono ścieżkę docelową: {target_browsers_path}")
-                    break
-            
-            # Jeśli nie znaleziono żadnej ścieżki, użyj pierwszej i utwórz katalogi
-            if target_browsers_path is None:
-                target_browsers_path = possible_target_paths[0]
+            # Znajdź pierwszą istniejącą ścieżkę docelową (kolejne kandydatki nie są nawet budowane)
+            target_browsers_path = next(
+                (path for path in _candidate_target_paths(internal_path, app_path)
+                 if os.path.isdir(os.path.dirname(path))),
+                None
+            )
+            if target_browsers_path is not None:
+                self._report_progress(f"📋 OPERACJA KOPIOWANIA: Znaleziono ścieżkę docelową: {target_browsers_path}")
+            else:
+                # Jeśli nie znaleziono żadnej ścieżki, użyj pierwszej i utwórz katalogi
+                target_browsers_path = next(_candidate_target_paths(internal_path, app_path))
                 self._report_progress(f"📋 OPERACJA KOPIOWANIA: Nie znaleziono istniejących katalogów, tworzę nowe: {target_browsers_path}")
-                os.makedirs(os.path.dirname(target_browsers_path), exist_ok=True)
             
-            # Utwórz katalog .local-browsers jeśli nie istnieje
+            # Utwórz katalog .local-browsers (razem z brakującymi katalogami nadrzędnymi)
             os.makedirs(target_browsers_path, exist_ok=True)
             
-            # Lista możliwych lokalizacji przeglądarek
-            possible_source_locations = []
-            
-            # 1. Standardowy katalog cache
-            cache_dir = Path.home() / ".cache" / "ms-playwright"
-            if cache_dir.exists():
-                possible_source_locations.append(str(cache_dir))
-            
-            # 2. Katalog AppData dla Windows
-            if os.name == 'nt':
-                appdata_path = Path(os.environ.get('LOCALAPPDATA', '')) / "ms-playwright"
-                if appdata_path.exists():
-                    possible_source_locations.append(str(appdata_path))
-            
-            # 3. Katalog systemowy dla Linux
-            if os.name == 'posix':
-                system_path = Path("/usr/local/share/playwright")
-                if system_path.exists():
-                    possible_source_locations.append(str(system_path))
-            
-            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Możliwe lokalizacje źródłowe: {possible_source_locations}")
-            
-            # Szukaj przeglądarki chromium we wszystkich lokalizacjach
-            for location in possible_source_locations:
-                self._report_progress(f"📋 OPERACJA KOPIOWANIA: Przeszukuję lokalizację: {location}")
-                
-                try:
-                    for item in os.listdir(location):
-                        if item.startswith("chromium-"):
-                            source_dir = os.path.join(location, item)
-                            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Znaleziono katalog chromium: {source_dir}")
-                            
-                            # Szczegółowe sprawdzenie zawartości katalogu źródłowego
-                            if os.path.isdir(source_dir):
-                                chrome_win_dir = os.path.join(source_dir, "chrome-win")
-                                chrome_exe = os.path.join(chrome_win_dir, "chrome.exe")
-                                
-                                # Sprawdź czy katalog chrome-win istnieje
-                                if not os.path.exists(chrome_win_dir):
-                                    self._report_progress(f"📋 OPERACJA KOPIOWANIA: Katalog chrome-win nie istnieje: {chrome_win_dir}")
-                                    # Sprawdź zawartość katalogu źródłowego
-                                    if os.path.exists(source_dir):
-                                        contents = os.listdir(source_dir)
-                                        self._report_progress(f"📋 OPERACJA KOPIOWANIA: Zawartość katalogu: {contents}")
-                                    continue
-                                
-                                # Sprawdź czy chrome.exe istnieje
-                                self._report_progress(f"📋 OPERACJA KOPIOWANIA: Sprawdzam chrome.exe: {chrome_exe}, istnieje: {os.path.exists(chrome_exe)}")
-                                
-                                if os.path.exists(chrome_exe) and os.path.getsize(chrome_exe) > 1000000:  # Upewnij się, że plik ma odpowiedni rozmiar
-                                    # To poprawny katalog z przeglądarką
-                                    target_dir = os.path.join(target_browsers_path, item)
-                                    self._report_progress(f"📋 OPERACJA KOPIOWANIA: Kopiuję z {source_dir} do {target_dir}")
-                                    
-                                    try:
-                                        # Usuń istniejący katalog docelowy, jeśli istnieje
-                                        if os.path.exists(target_dir):
-                                            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Usuwam istniejący katalog: {target_dir}")
-                                            shutil.rmtree(target_dir)
-                                        
-                                        # Kopiuj katalog
-                                        self._report_progress(f"📋 OPERACJA KOPIOWANIA: Rozpoczynam kopiowanie katalogu...")
-                                        
-                                        # Na systemie Windows, użyj robustcopy z nakładaniem czasowego limitu
-                                        if os.name == 'nt':
-                                            # Utwórz główny katalog celu
-                                            os.makedirs(target_dir, exist_ok=True)
-                                            
-                                            # Kopiowanie katalogu chrome-win
-                                            chrome_win_target = os.path.join(target_dir, "chrome-win")
-                                            os.makedirs(chrome_win_target, exist_ok=True)
-                                            
-                                            # Kopiuj pliki z chrome-win
-                                            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Kopiuję pliki chrome-win...")
-                                            for filename in os.listdir(chrome_win_dir):
-                                                src_file = os.path.join(chrome_win_dir, filename)
-                                                dst_file = os.path.join(chrome_win_target, filename)
-                                                
-                                                if os.path.isfile(src_file):
-                                                    try:
-                                                        shutil.copy2(src_file, dst_file)
-                                                    except Exception as e:
-                                                        self._report_progress(f"📋 OPERACJA KOPIOWANIA: Błąd kopiowania pliku {filename}: {e}")
-                                                elif os.path.isdir(src_file):
-                                                    try:
-                                                        shutil.copytree(src_file, dst_file, dirs_exist_ok=True)
-                                                    except Exception as e:
-                                                        self._report_progress(f"📋 OPERACJA KOPIOWANIA: Błąd kopiowania katalogu {filename}: {e}")
-                                        else:
-                                            # Na innych systemach użyj standardowego copytree
-                                            shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
-                                        
-                                        # Sprawdź czy kopiowanie powiodło się
-                                        target_chrome_exe = os.path.join(target_dir, "chrome-win", "chrome.exe")
-                                        if os.path.exists(target_chrome_exe):
-                                            self._report_progress(f"✅ OPERACJA KOPIOWANIA: Pomyślnie skopiowano przeglądarkę! Rozmiar chrome.exe: {os.path.getsize(target_chrome_exe)} bajtów")
-                                            
-                                            # Ustaw zmienną środowiskową, aby Playwright odnalazł przeglądarkę
-                                            os.environ["PLAYWRIGHT_BROWSERS_PATH"] = os.path.dirname(target_browsers_path)
-                                            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Ustawiono PLAYWRIGHT_BROWSERS_PATH={os.path.dirname(target_browsers_path)}")
-                                            
-                                            return True
-                                        else:
-                                            self._report_progress(f"❌ OPERACJA KOPIOWANIA: Kopiowanie nie powiodło się, chrome.exe nie istnieje w katalogu docelowym {target_chrome_exe}")
-                                    except Exception as e:
-                                        self._report_progress(f"❌ OPERACJA KOPIOWANIA: Błąd podczas kopiowania: {str(e)}")
-                except Exception as e:
-                    self._report_progress(f"❌ OPERACJA KOPIOWANIA: Błąd podczas przeszukiwania lokalizacji {location}: {str(e)}")
+            # Możliwe lokalizacje przeglądarek
+            possible_source_locations = _candidate_source_locations(self._default_cache_str, self._localappdata)
+            
+            # Szukaj przeglądarki chromium we wszystkich lokalizacjach jednocześnie
+            # (każda lokalizacja to osobne drzewo katalogów, operacje I/O nakładają się).
+            # Wyniki czytamy w kolejności priorytetu lokalizacji, żeby źródło kopii
+            # nie zależało od tego, które przeszukiwanie skończy się pierwsze.
+            locations = list(possible_source_locations)
+            if locations:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=len(locations)) as executor:
+                    searches = {executor.submit(_find_chromium_in, location): location for location in locations}
+                    
+                    for future in searches:
+                        location = searches[future]
+                        self._report_progress(f"📋 OPERACJA KOPIOWANIA: Przeszukuję lokalizację: {location}")
+                        try:
+                            source_dirs, messages = future.result()
+                        except Exception as e:
+                            self._report_progress(f"❌ OPERACJA KOPIOWANIA: Błąd podczas przeszukiwania lokalizacji {location}: {str(e)}")
+                            continue
+                        
+                        for message in messages:
+                            self._report_progress(message)
+                        
+                        for source_dir in source_dirs:
+                            if self._copy_chromium_source(source_dir, target_browsers_path):
+                                return True
             
             # Jeśli przeszukaliśmy wszystkie lokalizacje i nie znaleźliśmy przeglądarki, spróbujmy ostatni sposób
             self._report_progress("📋 OPERACJA KOPIOWANIA: Nie znaleziono odpowiedniej przeglądarki do skopiowania, próbuję alternatywne podejście...")
@@ -1445,7 +2014,7 @@ class PlaywrightManager:
                 
                 # Znajdź katalog który zawiera folder .local-browsers
                 # chrome.exe jest w .local-browsers/chromium-XXXX/chrome-win/chrome.exe
-                parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(browser_path))))
+                parent_dir = _ascend(browser_path, 4)
                 
                 self._report_progress(f"📋 OPERACJA KOPIOWANIA (ALT): Ustawiam PLAYWRIGHT_BROWSERS_PATH={parent_dir}")
                 os.environ["PLAYWRIGHT_BROWSERS_PATH"] = parent_dir
@@ -1458,6 +2027,92 @@ class PlaywrightManager:
             self._report_progress(f"❌ OPERACJA KOPIOWANIA: Nieoczekiwany błąd: {str(e)}")
             return False
 
+    def _copy_chromium_source(self, source_dir: str, target_browsers_path: str) -> bool:
+        """
+        Kopiuje katalog chromium-XXXX do .local-browsers aplikacji i ustawia PLAYWRIGHT_BROWSERS_PATH.
+        
+        Args:
+            source_dir: Katalog chromium-XXXX z poprawnym chrome-win/chrome.exe
+            target_browsers_path: Katalog .local-browsers wewnątrz aplikacji
+            
+        Returns:
+            bool: True, jeśli kopiowanie się powiodło
+        """
+        target_dir = os.path.join(target_browsers_path, os.path.basename(source_dir))
+        chrome_win_dir = os.path.join(source_dir, "chrome-win")
+        self._report_progress(f"📋 OPERACJA KOPIOWANIA: Kopiuję z {source_dir} do {target_dir}")
+        
+        try:
+            # Usuń istniejący katalog docelowy, jeśli istnieje
+            if os.path.isdir(target_dir):
+                self._report_progress(f"📋 OPERACJA KOPIOWANIA: Usuwam istniejący katalog: {target_dir}")
+                shutil.rmtree(target_dir)
+            
+            # Kopiuj katalog
+            self._report_progress(f"📋 OPERACJA KOPIOWANIA: Rozpoczynam kopiowanie katalogu...")
+            
+            # Na systemie Windows, użyj robustcopy z nakładaniem czasowego limitu
+            if os.name == 'nt':
+                # Kopiowanie katalogu chrome-win (makedirs tworzy też główny katalog celu)
+                chrome_win_target = os.path.join(target_dir, "chrome-win")
+                os.makedirs(chrome_win_target, exist_ok=True)
+                
+                # Kopiuj pliki z chrome-win
+                self._report_progress(f"📋 OPERACJA KOPIOWANIA: Kopiuję pliki chrome-win...")
+                with os.scandir(chrome_win_dir) as it:
+                    entries = list(it)
+                
+                # Pliki kopiowane równolegle - czas operacji I/O nakłada się między wątkami
+                with concurrent.futures.ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+                    file_entries = [entry for entry in entries if entry.is_file()]
+                    copy_results = executor.map(
+                        _copy_file_quietly,
+                        [entry.path for entry in file_entries],
+                        [os.path.join(chrome_win_target, entry.name) for entry in file_entries]
+                    )
+                    
+                    # Podkatalogi kopiowane w tym czasie w bieżącym wątku
+                    for entry in entries:
+                        if entry.is_dir():
+                            try:
+                                shutil.copytree(entry.path, os.path.join(chrome_win_target, entry.name), dirs_exist_ok=True)
+                            except Exception as e:
+                                self._report_progress_lazy("📋 OPERACJA KOPIOWANIA: Błąd kopiowania katalogu {}: {}", entry.name, e)
+                    
+                    failures = [
+                        f"{entry.name}: {error}"
+                        for entry, error in zip(file_entries, copy_results)
+                        if error is not None
+                    ]
+                
+                # Błędy kopiowania plików raportowane jednym komunikatem
+                if failures:
+                    self._report_progress(f"📋 OPERACJA KOPIOWANIA: Błąd kopiowania {len(failures)} plików: {'; '.join(failures)}")
+            else:
+                # Na innych systemach użyj standardowego copytree
+                shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
+            
+            # Sprawdź czy kopiowanie powiodło się
+            target_chrome_exe = os.path.join(target_dir, "chrome-win", "chrome.exe")
+            target_chrome_exe_size = _file_size(target_chrome_exe)
+            if target_chrome_exe_size is not None:
+                self._report_progress(f"✅ OPERACJA KOPIOWANIA: Pomyślnie skopiowano przeglądarkę! Rozmiar chrome.exe: {target_chrome_exe_size} bajtów")
+                
+                # Ustaw zmienną środowiskową, aby Playwright odnalazł przeglądarkę
+                os.environ["PLAYWRIGHT_BROWSERS_PATH"] = os.path.dirname(target_browsers_path)
+                self._report_progress(f"📋 OPERACJA KOPIOWANIA: Ustawiono PLAYWRIGHT_BROWSERS_PATH={os.path.dirname(target_browsers_path)}")
+                
+                # Układ katalogów aplikacji się zmienił
+                self._last_probe = None
+                self._sys_paths_cache = None
+                return True
+            else:
+                self._report_progress(f"❌ OPERACJA KOPIOWANIA: Kopiowanie nie powiodło się, chrome.exe nie istnieje w katalogu docelowym {target_chrome_exe}")
+        except Exception as e:
+            self._report_progress(f"❌ OPERACJA KOPIOWANIA: Błąd podczas kopiowania: {str(e)}")
+        
+        return False
+    
     def _try_load_browser_redirection(self):
         """
         Próbuje załadować informacje o przekierowaniu przeglądarek z pliku.
@@ -1471,14 +2126,9 @@ class PlaywrightManager:
                 self._report_progress("📖 PRZEKIEROWANIE: Nie jesteśmy w środowisku PyInstaller, pomijam")
                 return False
             
-            # Ustal ścieżkę do pliku przekierowania
-            base_path = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
-            
-            # Sprawdź, czy _internal występuje już w ścieżce
-            if base_path.endswith('_internal'):
-                internal_path = base_path
-            else:
-                internal_path = os.path.join(base_path, "_internal")
+            # Ustal ścieżkę do pliku przekierowania (ścieżki aplikacji wyliczone raz na obiekt)
+            base_path = self._pyinstaller_paths.base
+            internal_path = self._pyinstaller_paths.internal
             
             # Możliwe ścieżki do pliku przekierowania
             possible_paths = [
@@ -1492,7 +2142,7 @@ class PlaywrightManager:
             # Szukaj pliku przekierowania
             redirection_path = None
             for path in possible_paths:
-                if os.path.exists(path):
+                if os.path.isfile(path):
                     redirection_path = path
                     self._report_progress(f"📖 PRZEKIEROWANIE: Znaleziono plik przekierowania: {redirection_path}")
                     break
@@ -1503,9 +2153,8 @@ class PlaywrightManager:
                 return False
             
             # Załaduj plik
-            import json
-            with open(redirection_path, 'r', encoding='utf-8') as f:
-                redirection_data = json.load(f)
+            data = Path(redirection_path).read_bytes()
+            redirection_data = _json_loads(data if _JSON_LOADS_BYTES else data.decode('utf-8'))
             
             # Sprawdź czy dane zawierają ścieżki przeglądarek
             if 'browser_paths' not in redirection_data:
@@ -1517,43 +2166,14 @@ class PlaywrightManager:
             
             # Sprawdź czy któraś z przeglądarek jest dostępna
             for key, path in browser_paths.items():
-                if os.path.exists(path):
+                # W zależności od typu przeglądarki, ustaw odpowiednią zmienną środowiskową
+                handler = self._REDIRECT_HANDLERS.get(key)
+                if handler is None and key.startswith("chromium"):
+                    handler = PlaywrightManager._redirect_to_chromium
+                
+                if handler is not None and os.path.isfile(path):
                     self._report_progress(f"📖 PRZEKIEROWANIE: Znaleziono przeglądarkę {key}: {path}")
-                    
-                    # W zależności od typu przeglądarki, ustaw odpowiednią zmienną środowiskową
-                    if key.startswith("chromium"):
-                        # Znajdź katalog nadrzędny przeglądarki
-                        chromium_parent = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(path))))
-                        self._report_progress(f"📖 PRZEKIEROWANIE: Ustawiam PLAYWRIGHT_BROWSERS_PATH={chromium_parent}")
-                        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = chromium_parent
-                        return True
-                    elif key == "chrome_system" or key == "edge_system":
-                        # Dla systemowego Chrome/Edge, ustaw zmienną na katalog tymczasowy i dodaj wpis dla Chromium
-                        import tempfile
-                        temp_dir = os.path.join(tempfile.gettempdir(), "ms-playwright-redirect")
-                        os.makedirs(temp_dir, exist_ok=True)
-                        
-                        # Utwórz katalog browsers z odnośnikiem do systemowej przeglądarki
-                        browsers_dir = os.path.join(temp_dir, ".local-browsers")
-                        os.makedirs(browsers_dir, exist_ok=True)
-                        
-                        # Utwórz plik wskazujący na systemową przeglądarkę
-                        system_browser_json = os.path.join(temp_dir, "system_browser.json")
-                        with open(system_browser_json, 'w', encoding='utf-8') as f:
-                            json.dump({
-                                "executable": path,
-                                "browser": "chromium" if key == "chrome_system" else "msedge"
-                            }, f, indent=2)
-                        
-                        # Ustaw zmienną środowiskową
-                        self._report_progress(f"📖 PRZEKIEROWANIE: Ustawiam PLAYWRIGHT_BROWSERS_PATH={temp_dir}")
-                        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = temp_dir
-                        
-                        # Dodatkowo można ustawić PLAYWRIGHT_CHROMIUM_EXECUTABLE
-                        self._report_progress(f"📖 PRZEKIEROWANIE: Ustawiam PLAYWRIGHT_CHROMIUM_EXECUTABLE={path}")
-                        os.environ["PLAYWRIGHT_CHROMIUM_EXECUTABLE"] = path
-                        
-                        return True
+                    return handler(self, key, path)
             
             self._report_progress("📖 PRZEKIEROWANIE: Nie znaleziono dostępnych przeglądarek w pliku przekierowania")
             return False
@@ -1562,9 +2182,84 @@ class PlaywrightManager:
             self._report_progress(f"📖 PRZEKIEROWANIE: Błąd podczas ładowania pliku przekierowania: {e}")
             return False
 
+    def _redirect_to_chromium(self, key: str, path: str) -> bool:
+        """Wskazuje Playwright katalog ms-playwright zawierający przeglądarkę Chromium."""
+        # Znajdź katalog nadrzędny przeglądarki
+        chromium_parent = _ascend(path, 4)
+        self._report_progress(f"📖 PRZEKIEROWANIE: Ustawiam PLAYWRIGHT_BROWSERS_PATH={chromium_parent}")
+        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = chromium_parent
+        return True
+    
+    def _redirect_to_system_browser(self, key: str, path: str) -> bool:
+        """Wskazuje Playwright systemowy Chrome/Edge przez katalog tymczasowy."""
+        # Dla systemowego Chrome/Edge, ustaw zmienną na katalog tymczasowy i dodaj wpis dla Chromium
+        import tempfile
+        temp_dir = os.path.join(tempfile.gettempdir(), "ms-playwright-redirect")
+        
+        # Utwórz katalog browsers z odnośnikiem do systemowej przeglądarki (razem z temp_dir)
+        browsers_dir = os.path.join(temp_dir, ".local-browsers")
+        os.makedirs(browsers_dir, exist_ok=True)
+        
+        # Utwórz plik wskazujący na systemową przeglądarkę
+        system_browser_json = os.path.join(temp_dir, "system_browser.json")
+        with open(system_browser_json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "executable": path,
+                "browser": "chromium" if key == "chrome_system" else "msedge"
+            }, f, indent=2)
+        
+        # Ustaw zmienną środowiskową
+        self._report_progress(f"📖 PRZEKIEROWANIE: Ustawiam PLAYWRIGHT_BROWSERS_PATH={temp_dir}")
+        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = temp_dir
+        
+        # Dodatkowo można ustawić PLAYWRIGHT_CHROMIUM_EXECUTABLE
+        self._report_progress(f"📖 PRZEKIEROWANIE: Ustawiam PLAYWRIGHT_CHROMIUM_EXECUTABLE={path}")
+        os.environ["PLAYWRIGHT_CHROMIUM_EXECUTABLE"] = path
+        
+        return True
+    
+    # Obsługa wpisów pliku przekierowania (pozostałe klucze "chromium*" trafiają do _redirect_to_chromium)
+    _REDIRECT_HANDLERS = {
+        "chromium": _redirect_to_chromium,
+        "chromium_appdata": _redirect_to_chromium,
+        "chrome_system": _redirect_to_system_browser,
+        "edge_system": _redirect_to_system_browser,
+    }
+
+# Czas (w sekundach), przez który wynik check_playwright_availability jest ponownie używany
+AVAILABILITY_TTL = 5.0
+
+# Ostatni wynik check_playwright_availability: (czas time.monotonic(), wynik)
+_last_availability_check: Optional[Tuple[float, bool]] = None
+
+# Menedżer współdzielony przez kolejne wywołania check_playwright_availability - jego
+# zapamiętany status (ważny do zmiany katalogu cache) przetrwa wygaśnięcie AVAILABILITY_TTL
+_availability_manager: Optional[PlaywrightManager] = None
+
+
 # Funkcja pomocnicza do sprawdzenia, czy playwright jest dostępny
-def check_playwright_availability() -> bool:
-    """Sprawdza, czy pakiet playwright jest dostępny w systemie."""
-    mgr = PlaywrightManager()
-    status = mgr.get_installation_status()
-    return status["playwright_installed"] and any(status["browsers"].values()) 
\ No newline at end of file
+def check_playwright_availability(ttl: float = AVAILABILITY_TTL) -> bool:
+    """
+    Sprawdza, czy pakiet playwright jest dostępny w systemie.
+    
+    Wynik jest ponownie używany przez `ttl` sekund (domyślnie AVAILABILITY_TTL).
+    """
+    global _last_availability_check, _availability_manager
+    now = time.monotonic()
+    if _last_availability_check is not None and now - _last_availability_check[0] < ttl:
+        return _last_availability_check[1]
+    
+    if _availability_manager is None:
+        _availability_manager = PlaywrightManager()
+    status = _availability_manager.get_installation_status()
+    available = status["playwright_installed"] and any(status["browsers"].values())
+    _last_availability_check = (now, available)
+    return available
+
+
+def invalidate_playwright_availability_cache():
+    """Wymusza ponowne sprawdzenie przy następnym wywołaniu check_playwright_availability."""
+    global _last_availability_check
+    _last_availability_check = None
+    if _availability_manager is not None:
+        _availability_manager._invalidate_status()
@@ -3,18 +3,16 @@
 
 import asyncio
 import os
+import re
 import sys
 import tempfile
-import nest_asyncio
+import threading
+import weakref
 from datetime import datetime
 from playwright.async_api import async_playwright
 from app.utils.logger import setup_logger
 from app.utils.config_loader import config
 
-# Zastosowanie nest_asyncio pozwala na zagnieżdżanie pętli zdarzeń asyncio,
-# co rozwiązuje problem z "There is no current event loop in thread"
-nest_asyncio.apply()
-
 # Inicjalizacja loggera w bloku try-except dla bezpieczeństwa
 try:
     logger = setup_logger()
@@ -25,14 +23,126 @@ except Exception as e:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     logger = logging.getLogger("PlaywrightRunner")
 
+# Przedrostek schematu i znaki zamieniane na "_" przy budowaniu nazwy pliku zrzutu ekranu z URL
+_URL_PREFIX_RE = re.compile(r'^https?://')
+_SAFE_TBL = str.maketrans({'/': '_', '.': '_', ':': '_', '?': '_', '&': '_'})
+
+
+# Wymiary okna, liczniki elementów i czasy ładowania (ms od początku nawigacji) pobierane jednym page.evaluate
+_PAGE_STATS_JS = """() => {
+    const count = (selector) => document.querySelectorAll(selector).length;
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const paint = performance.getEntriesByType('paint').find((entry) => entry.name === 'first-contentful-paint');
+    return {
+        timing: {
+            firstContentfulPaint: paint ? paint.startTime : null,
+            load: navigation ? (navigation.loadEventEnd || navigation.loadEventStart || null) : null
+        },
+        dimensions: {
+            width: window.innerWidth,
+            height: window.innerHeight,
+            devicePixelRatio: window.devicePixelRatio
+        },
+        links: count('a'),
+        images: count('img'),
+        forms: count('form'),
+        buttons: count('button')
+    };
+}"""
+
+
+# Katalogi zrzutów ekranu już utworzone w tym procesie (kolejne instancje nie sprawdzają ich ponownie)
+_created_dirs = set()
+
+
+def _ensure_dir(path):
+    """Tworzy katalog przy pierwszym użyciu w procesie."""
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
+
+# Jakość zrzutów ekranu zapisywanych jako JPEG
+JPEG_QUALITY = 70
+
+# Typy zasobów pomijanych w trybie lekkim (light_mode)
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+
+async def _block_heavy_resources(route):
+    """Przerywa żądania zasobów niepotrzebnych do analizy strony, pozostałe przepuszcza."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _safe_name(url):
+    """Zamienia URL na fragment nazwy pliku (jedno przejście zamiast kilku str.replace)."""
+    return _URL_PREFIX_RE.sub('', url).translate(_SAFE_TBL)
+
+
+class _LoopThread(threading.Thread):
+    """Wątek w tle z trwałą pętlą zdarzeń, w której działają Playwright i przeglądarka."""
+    
+    def __init__(self):
+        super().__init__(name="PlaywrightRunnerLoop", daemon=True)
+        self.loop = asyncio.new_event_loop()
+    
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+
+_loop_thread = None
+_loop_thread_lock = threading.Lock()
+
+
+def _get_loop():
+    """Zwraca pętlę zdarzeń wątku w tle, uruchamiając wątek przy pierwszym użyciu."""
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None or not _loop_thread.is_alive():
+            _loop_thread = _LoopThread()
+            _loop_thread.start()
+        return _loop_thread.loop
+
+
+# Utworzone instancje PlaywrightRunner - przy wyjściu z aplikacji zamykane są ich przeglądarki
+_runners = weakref.WeakSet()
+
+
+def close_all_runners():
+    """Zamyka przeglądarki wszystkich instancji PlaywrightRunner (podpinane pod QApplication.aboutToQuit)."""
+    for runner in list(_runners):
+        runner.close()
+
+
 class PlaywrightRunner:
     def __init__(self):
         self.results = []
         self.screenshot_path = None
+        # Tryb lekki: bez pobierania obrazów, mediów, czcionek i stylów (szybsze ładowanie,
+        # ale zrzut ekranu nie pokazuje pełnego wyglądu strony)
+        self.light_mode = False
+        # Format zrzutów ekranu: "jpeg" (domyślnie, mniejsze pliki) lub "png" (bezstratny)
+        self.screenshot_format = "jpeg"
+        
+        # Playwright i przeglądarka (w pętli wątku w tle) są uruchamiane raz i współdzielone
+        # przez kolejne wywołania run_test/run_tests - każdy test dostaje tylko nowy kontekst;
+        # zamyka je close() (dla wszystkich instancji close_all_runners przy wyjściu z aplikacji)
+        self._pw = None
+        self._browser = None
+        self._browser_headless = None
+        self._browser_lock = None
+        _runners.add(self)
         
         try:
             # Pobieranie konfiguracji
             self.timeout = config.get_int("PLAYWRIGHT", "timeout", 30000)
+            self.light_mode = config.get_bool("PLAYWRIGHT", "light_mode", False)
+            screenshot_format = str(config.get_value("PLAYWRIGHT", "screenshot_format", "jpeg")).lower()
+            self.screenshot_format = "png" if screenshot_format == "png" else "jpeg"
             
             # Określ katalog dla zrzutów ekranu w zależności od środowiska
             if getattr(sys, 'frozen', False):
@@ -52,14 +162,14 @@ class PlaywrightRunner:
                 )
                 
             # Upewniamy się, że katalog na zrzuty ekranu istnieje
-            os.makedirs(self.screenshot_dir, exist_ok=True)
+            _ensure_dir(self.screenshot_dir)
             
         except Exception as e:
             logger.error(f"Błąd inicjalizacji PlaywrightRunner: {e}")
             # Ustaw wartości domyślne
             self.timeout = 30000
             self.screenshot_dir = tempfile.gettempdir()
-            os.makedirs(self.screenshot_dir, exist_ok=True)
+            _ensure_dir(self.screenshot_dir)
     
     def run_test(self, url, headless=False):
         """
@@ -72,130 +182,240 @@ class PlaywrightRunner:
         Returns:
             tuple: (wyniki testu, ścieżka do zrzutu ekranu)
         """
-        # Utworzenie nowej pętli zdarzeń dla tego wątku
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        # Test działa w trwałej pętli wątku w tle - uchwyt przeglądarki jest z nią związany
         try:
-            return loop.run_until_complete(self._run_test_async(url, headless))
+            return asyncio.run_coroutine_threadsafe(self._run_test_async(url, headless), _get_loop()).result()
         except Exception as e:
             error_msg = f"Nieprzewidziany błąd podczas wykonywania testu: {e}"
             logger.error(error_msg)
             self.results.append(error_msg)
             return "\n".join(self.results), None
-        finally:
-            loop.close()
+    
+    def run_tests(self, urls, headless=False, concurrency=5):
+        """
+        Uruchamia testy Playwright dla wielu URL równolegle we wspólnej przeglądarce.
+        
+        Każdy URL dostaje własny kontekst przeglądarki; jednocześnie działa
+        co najwyżej `concurrency` kontekstów.
+        
+        Args:
+            urls (list): Adresy URL do przetestowania
+            headless (bool): Czy uruchomić przeglądarkę w trybie headless
+            concurrency (int): Maksymalna liczba jednocześnie testowanych stron
+            
+        Returns:
+            list: Słowniki {"url", "wyniki", "zrzut_ekranu"} w kolejności adresów
+        """
+        async def run_all():
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            
+            async def run_limited(url):
+                results = []
+                async with semaphore:
+                    screenshot_path = await self._run_one(url, headless, results)
+                return {"url": url, "wyniki": "\n".join(results), "zrzut_ekranu": screenshot_path}
+            
+            return await asyncio.gather(*(run_limited(url) for url in urls))
+        
+        try:
+            return asyncio.run_coroutine_threadsafe(run_all(), _get_loop()).result()
+        except Exception as e:
+            error_msg = f"Nieprzewidziany błąd podczas wykonywania testów: {e}"
+            logger.error(error_msg)
+            return [{"url": url, "wyniki": error_msg, "zrzut_ekranu": None} for url in urls]
+    
+    def close(self):
+        """
+        Zamyka przeglądarkę i zatrzymuje Playwright.
+        
+        Należy wywołać po zakończeniu wszystkich testów - przeglądarka pozostaje
+        uruchomiona między kolejnymi wywołaniami run_test/run_tests.
+        """
+        if self._pw is None and self._browser is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.shutdown(), _get_loop()).result()
+        except Exception as e:
+            logger.error(f"Błąd podczas zamykania Playwright: {e}")
+    
+    async def _ensure_browser(self, headless=False, results=None):
+        """
+        Zwraca uruchomioną przeglądarkę Chromium, uruchamiając ją tylko przy pierwszym użyciu.
+        
+        Przeglądarka jest uruchamiana ponownie, jeśli zmienił się tryb headless
+        albo połączenie z nią zostało zerwane.
+        """
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        
+        async with self._browser_lock:
+            if self._browser is not None:
+                if self._browser_headless == headless and self._browser.is_connected():
+                    return self._browser
+                await self._close_browser()
+            
+            if self._pw is None:
+                self._pw = await async_playwright().start()
+            
+            self._log("Uruchamianie przeglądarki...", results)
+            self._browser = await self._pw.chromium.launch(headless=headless)
+            self._browser_headless = headless
+            return self._browser
+    
+    async def _close_browser(self):
+        """Zamyka współdzieloną przeglądarkę, jeśli jest uruchomiona."""
+        browser, self._browser = self._browser, None
+        self._browser_headless = None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Błąd podczas zamykania przeglądarki: {e}")
+    
+    async def shutdown(self):
+        """Zamyka współdzieloną przeglądarkę i zatrzymuje Playwright."""
+        await self._close_browser()
+        pw, self._pw = self._pw, None
+        if pw is not None:
+            try:
+                await pw.stop()
+            except Exception as e:
+                logger.warning(f"Błąd podczas zatrzymywania Playwright: {e}")
     
     async def _run_test_async(self, url, headless=False):
-        logger.info(f"Uruchamianie testu Playwright dla {url} (headless: {headless})")
         self.results = []
-        self.screenshot_path = None
+        self.screenshot_path = await self._run_one(url, headless, self.results)
+        return "\n".join(self.results), self.screenshot_path
+    
+    async def _run_one(self, url, headless, results):
+        """
+        Wykonuje test jednego URL we własnym kontekście współdzielonej przeglądarki.
+        
+        Args:
+            url (str): Adres URL do przetestowania
+            headless (bool): Czy uruchomić przeglądarkę w trybie headless
+            results (list): Lista, do której trafiają komunikaty tego testu
+            
+        Returns:
+            str: Ścieżka do zrzutu ekranu lub None
+        """
+        logger.info(f"Uruchamianie testu Playwright dla {url} (headless: {headless})")
+        screenshot_path = None
+        # Wspólna końcówka nazw plików zrzutów (udanego testu i błędu) liczona raz na test
+        screenshot_suffix = f"_{_safe_name(url)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{self._screenshot_extension()}"
         
         try:
-            async with async_playwright() as p:
-                self._log("Uruchamianie przeglądarki...")
-                browser = await p.chromium.launch(headless=headless)
-                context = await browser.new_context()
-                page = await context.new_page()
+            browser = await self._ensure_browser(headless, results)
+            # Nowy kontekst izoluje test (ciasteczka, pamięć) bez ponownego uruchamiania przeglądarki
+            context = await browser.new_context()
+            page = await context.new_page()
+            
+            if self.light_mode:
+                await page.route("**/*", _block_heavy_resources)
+            
+            # Metryki wydajności z CDP (Performance.getMetrics) zamiast przestarzałego performance.timing
+            cdp = None
+            try:
+                cdp = await context.new_cdp_session(page)
+                await cdp.send("Performance.enable")
+            except Exception as e:
+                logger.warning(f"Nie udało się włączyć metryk wydajności CDP: {e}")
+                cdp = None
+            
+            # Ustawienie timeoutu
+            page.set_default_timeout(self.timeout)
+            
+            try:
+                self._log(f"Otwieranie strony: {url}", results)
+                # Tytuł jest dostępny już po załadowaniu DOM
+                await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+                
+                self._log("Pobieranie tytułu strony...", results)
+                title = await page.title()
+                self._log(f"Tytuł strony: {title}", results)
+                
+                # Zrzut ekranu wymaga wyrenderowanej strony (obrazy, style) - czekamy na zdarzenie load
+                await page.wait_for_load_state("load", timeout=self.timeout)
+                
+                # Dodatkowe informacje o stronie
+                self._log("Pobieranie informacji o stronie...", results)
+                # Wszystkie informacje o stronie jednym wywołaniem evaluate (jedna wymiana z przeglądarką)
+                stats = await page.evaluate(_PAGE_STATS_JS)
+                dimensions = stats['dimensions']
+                self._log(f"Wymiary okna: {dimensions['width']}x{dimensions['height']}", results)
+                
+                # Wykonanie zrzutu ekranu
+                self._log("Robienie zrzutu ekranu...", results)
+                screenshot_path = os.path.join(self.screenshot_dir, "screenshot" + screenshot_suffix)
+                
+                # Upewnij się, że katalog istnieje (sprawdzane raz w procesie)
+                _ensure_dir(self.screenshot_dir)
                 
-                # Ustawienie timeoutu
-                page.set_default_timeout(self.timeout)
+                await page.screenshot(path=screenshot_path, **self._screenshot_options())
+                self._log(f"Zrzut ekranu zapisany: {screenshot_path}", results)
                 
+                # Analiza strony
+                self._log("Pobieranie elementów strony...", results)
+                self._log(f"Liczba linków na stronie: {stats['links']}", results)
+                self._log(f"Liczba obrazów na stronie: {stats['images']}", results)
+                self._log(f"Liczba formularzy na stronie: {stats['forms']}", results)
+                self._log(f"Liczba przycisków na stronie: {stats['buttons']}", results)
+                
+                # Sprawdzanie wydajności strony
+                self._log("Sprawdzanie wydajności strony...", results)
+                timing = stats['timing']
+                if timing['load']:
+                    self._log(f"Czas ładowania strony: {round(timing['load'])} ms", results)
+                if timing['firstContentfulPaint']:
+                    self._log(f"Czas pierwszego renderowania treści: {round(timing['firstContentfulPaint'])} ms", results)
                 try:
-                    self._log(f"Otwieranie strony: {url}")
-                    await page.goto(url)
-                    
-                    self._log("Pobieranie tytułu strony...")
-                    title = await page.title()
-                    self._log(f"Tytuł strony: {title}")
-                    
-                    # Dodatkowe informacje o stronie
-                    self._log("Pobieranie informacji o stronie...")
-                    dimensions = await page.evaluate("""() => {
-                        return {
-                            width: window.innerWidth,
-                            height: window.innerHeight,
-                            devicePixelRatio: window.devicePixelRatio
-                        }
-                    }""")
-                    self._log(f"Wymiary okna: {dimensions['width']}x{dimensions['height']}")
-                    
-                    # Wykonanie zrzutu ekranu
-                    self._log("Robienie zrzutu ekranu...")
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    clean_url = url.replace('https://', '').replace('http://', '').replace('/', '_').replace('.', '_')
-                    filename = f"screenshot_{clean_url}_{timestamp}.png"
-                    self.screenshot_path = os.path.join(self.screenshot_dir, filename)
-                    
-                    # Upewnij się, że katalog istnieje
-                    os.makedirs(os.path.dirname(self.screenshot_path), exist_ok=True)
-                    
-                    await page.screenshot(path=self.screenshot_path)
-                    self._log(f"Zrzut ekranu zapisany: {self.screenshot_path}")
-                    
-                    # Analiza strony
-                    self._log("Pobieranie elementów strony...")
-                    # Liczenie linków
-                    links_count = await page.evaluate("document.querySelectorAll('a').length")
-                    self._log(f"Liczba linków na stronie: {links_count}")
-                    
-                    # Liczenie obrazów
-                    images_count = await page.evaluate("document.querySelectorAll('img').length")
-                    self._log(f"Liczba obrazów na stronie: {images_count}")
-                    
-                    # Liczenie formularzy
-                    forms_count = await page.evaluate("document.querySelectorAll('form').length")
-                    self._log(f"Liczba formularzy na stronie: {forms_count}")
-                    
-                    # Liczenie przycisków
-                    buttons_count = await page.evaluate("document.querySelectorAll('button').length")
-                    self._log(f"Liczba przycisków na stronie: {buttons_count}")
-                    
-                    # Sprawdzanie wydajności strony
-                    self._log("Sprawdzanie wydajności strony...")
-                    try:
-                        performance = await page.evaluate("""() => {
-                            const performance = window.performance;
-                            const timing = performance.timing;
-                            return {
-                                loadTime: timing.loadEventEnd - timing.navigationStart,
-                                domContentLoaded: timing.domContentLoadedEventEnd - timing.navigationStart,
-                                firstPaint: timing.responseEnd - timing.navigationStart
-                            }
-                        }""")
-                        
-                        self._log(f"Czas ładowania strony: {performance['loadTime']} ms")
-                        self._log(f"Czas ładowania DOM: {performance['domContentLoaded']} ms")
-                        self._log(f"Czas pierwszego renderowania: {performance['firstPaint']} ms")
-                    except Exception as e:
-                        self._log(f"Nie udało się pobrać informacji o wydajności: {str(e)}")
+                    if cdp is None:
+                        raise RuntimeError("sesja CDP jest niedostępna")
+                    metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
                     
+                    # Znaczniki czasu CDP są w sekundach
+                    navigation_start = metrics.get("NavigationStart", 0)
+                    if metrics.get("DomContentLoaded"):
+                        self._log(f"Czas ładowania DOM: {round((metrics['DomContentLoaded'] - navigation_start) * 1000)} ms", results)
+                    self._log(f"Liczba przeliczeń układu strony: {int(metrics.get('LayoutCount', 0))}", results)
+                    self._log(f"Czas przeliczania stylów: {round(metrics.get('RecalcStyleDuration', 0) * 1000)} ms", results)
+                    self._log(f"Czas wykonywania skryptów: {round(metrics.get('ScriptDuration', 0) * 1000)} ms", results)
                 except Exception as e:
-                    error_message = f"Błąd podczas testowania strony: {str(e)}"
-                    self._log(error_message)
-                    logger.error(error_message)
-                    
-                    # Spróbuj zrobić zrzut ekranu błędu, jeśli to możliwe
-                    try:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        clean_url = url.replace('https://', '').replace('http://', '').replace('/', '_').replace('.', '_')
-                        filename = f"error_{clean_url}_{timestamp}.png"
-                        self.screenshot_path = os.path.join(self.screenshot_dir, filename)
-                        await page.screenshot(path=self.screenshot_path)
-                        self._log(f"Zrzut ekranu błędu zapisany: {self.screenshot_path}")
-                    except Exception as screenshot_error:
-                        self._log(f"Nie udało się zrobić zrzutu ekranu błędu: {screenshot_error}")
+                    self._log(f"Nie udało się pobrać informacji o wydajności: {str(e)}", results)
                 
-                finally:
-                    self._log("Zamykanie przeglądarki...")
-                    await browser.close()
+            except Exception as e:
+                error_message = f"Błąd podczas testowania strony: {str(e)}"
+                self._log(error_message, results)
+                logger.error(error_message)
+                
+                # Spróbuj zrobić zrzut ekranu błędu, jeśli to możliwe
+                try:
+                    screenshot_path = os.path.join(self.screenshot_dir, "error" + screenshot_suffix)
+                    await page.screenshot(path=screenshot_path, **self._screenshot_options())
+                    self._log(f"Zrzut ekranu błędu zapisany: {screenshot_path}", results)
+                except Exception as screenshot_error:
+                    self._log(f"Nie udało się zrobić zrzutu ekranu błędu: {screenshot_error}", results)
+            
+            finally:
+                self._log("Zamykanie kontekstu przeglądarki...", results)
+                await context.close()
         except Exception as e:
             error_message = f"Nieoczekiwany błąd Playwright: {str(e)}"
-            self._log(error_message)
+            self._log(error_message, results)
             logger.error(error_message)
             
-        return "\n".join(self.results), self.screenshot_path
+        return screenshot_path
+    
+    def _screenshot_extension(self):
+        """Rozszerzenie pliku zrzutu ekranu dla wybranego formatu."""
+        return ".png" if self.screenshot_format == "png" else ".jpg"
+    
+    def _screenshot_options(self):
+        """Argumenty page.screenshot dla wybranego formatu (JPEG z jakością 70)."""
+        if self.screenshot_format == "png":
+            return {"type": "png"}
+        return {"type": "jpeg", "quality": JPEG_QUALITY}
     
-    def _log(self, message):
-        self.results.append(message)
+    def _log(self, message, results=None):
+        (self.results if results is None else results).append(message)
         logger.info(message)
@@ -8,6 +8,9 @@ import os
 from typing import Dict, Any, Optional, Callable
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
+# Maksymalna liczba kart pobierających faktury z różnych tygodni jednocześnie
+MAX_WEEK_WORKERS = 5
+
 class PlaywrightTest:
     def __init__(self, config: Dict[str, Any], progress_callback: Optional[Callable[[int], None]] = None):
         self.config = config
@@ -20,6 +23,9 @@ class PlaywrightTest:
             "pobrane_elementy": 0,
             "bledy": 0
         }
+        # Postęp pobierania faktur: licznik wykonanych jednostek i zdarzenie budzące raportowanie
+        self._progress_event: Optional[asyncio.Event] = None
+        self._done_units = 0
     
     async def initialize(self):
         """Inicjalizuje Playwright i przeglądarkę."""
@@ -87,8 +93,9 @@ class PlaywrightTest:
     async def _run_generic_test(self) -> Dict[str, Any]:
         """Uruchamia ogólny test dla dowolnej strony."""
         try:
-            # Sprawdzenie czy strona się załadowała
-            await self.page.wait_for_load_state("networkidle")
+            # Sprawdzenie czy strona się załadowała (do odczytu tytułu wystarczy DOM;
+            # networkidle zostaje tylko tam, gdzie jest potrzebne, np. po logowaniu e-urtica)
+            await self.page.wait_for_load_state("domcontentloaded")
             
             # Sprawdzenie tytułu strony
             title = await self.page.title()
@@ -123,7 +130,11 @@ class PlaywrightTest:
         # Obliczenie zakresu dat
         today = datetime.now()
         weeks = self.config["e_urtica"]["tygodnie_do_przetworzenia"]
+        if weeks <= 0:
+            return
         
+        # Tygodnie są niezależne - rozdzielamy je między kilka kart w zalogowanym kontekście
+        queue: asyncio.Queue = asyncio.Queue()
         for week in range(weeks):
             start_date = today - timedelta(days=today.weekday() + (week * 7))
             end_date = start_date + timedelta(days=6)
@@ -133,15 +144,76 @@ class PlaywrightTest:
             folder_path = Path(self.config["e_urtica"]["folder_faktur"]) / folder_name
             folder_path.mkdir(parents=True, exist_ok=True)
             
-            # Pobieranie faktur z danego tygodnia
-            await self._pobierz_faktury_z_tygodnia(start_date, end_date, folder_path)
+            queue.put_nowait((start_date, end_date, folder_path))
+        
+        self._done_units = 0
+        self._progress_event = asyncio.Event()
+        
+        async def worker():
+            # Nowa karta w tym samym kontekście korzysta z sesji po zalogowaniu
+            page = await self.context.new_page()
+            try:
+                while True:
+                    try:
+                        start_date, end_date, folder_path = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    
+                    # Pobieranie faktur z danego tygodnia
+                    await self._pobierz_faktury_z_tygodnia(start_date, end_date, folder_path, page)
+                    
+                    self._advance_progress()
+            finally:
+                await page.close()
+        
+        tasks = [asyncio.ensure_future(worker()) for _ in range(min(weeks, MAX_WEEK_WORKERS))]
+        workers = asyncio.gather(*tasks)
+        reporter = asyncio.ensure_future(self._report_progress(weeks, workers))
+        try:
+            await workers
+        except BaseException:
+            # gather nie przerywa pozostałych zadań po pierwszym błędzie - zatrzymujemy je,
+            # żeby nie pobierały kolejnych tygodni, i czekamy na zamknięcie ich kart
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            await reporter
+    
+    def _advance_progress(self, units: int = 1):
+        """Zwiększa licznik wykonanej pracy i budzi zadanie raportujące postęp."""
+        self._done_units += units
+        if self._progress_event is not None:
+            self._progress_event.set()
+    
+    async def _report_progress(self, total: int, work: "asyncio.Future"):
+        """
+        Przekazuje postęp do progress_callback, gdy licznik się zmieni.
+        
+        Zadanie śpi do ustawienia zdarzenia postępu albo zakończenia pracy (bez
+        odpytywania); po zakończeniu pracy raportowany jest stan końcowy.
+        """
+        last_progress = None
+        while True:
+            if not work.done():
+                event_task = asyncio.ensure_future(self._progress_event.wait())
+                await asyncio.wait({event_task, work}, return_when=asyncio.FIRST_COMPLETED)
+                if not event_task.done():
+                    event_task.cancel()
+                self._progress_event.clear()
             
-            if self.progress_callback:
-                progress = int((week + 1) / weeks * 100)
+            progress = min(100, int(self._done_units / total * 100))
+            if self.progress_callback and progress != last_progress:
                 self.progress_callback(progress)
+                last_progress = progress
+            
+            if work.done():
+                return
     
-    async def _pobierz_faktury_z_tygodnia(self, start_date: datetime, end_date: datetime, folder_path: Path):
-        """Pobiera faktury z danego tygodnia."""
+    async def _pobierz_faktury_z_tygodnia(self, start_date: datetime, end_date: datetime, folder_path: Path,
+                                          page: Optional[Page] = None):
+        """Pobiera faktury z danego tygodnia (na podanej karcie, domyślnie self.page)."""
         # Implementacja pobierania faktur
         # To jest uproszczona wersja - pełna implementacja wymagałaby więcej kodu
         pass 
\ No newline at end of file
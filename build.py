@@ -2,59 +2,360 @@
 # -*- coding: utf-8 -*-
 
 import os
+import argparse
+import atexit
+import functools
 import subprocess
-import platform
 import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
+import logging.handlers
+import queue
 
-# Konfiguracja loggera
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("build.log", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
+from build_config import APP_NAME, requirements_fingerprint, read_requirements_stamp, write_requirements_stamp
+
+# Rozmiar bufora pliku build.log
+LOG_FILE_BUFSIZE = 64 * 1024
+
+# Rekordy od tego poziomu są zapisywane na dysk od razu (błąd nie zginie przy zabiciu procesu)
+LOG_FLUSH_LEVEL = logging.WARNING
+
+# Maksymalny czas (w sekundach), przez jaki pozostałe rekordy czekają w buforze
+LOG_FLUSH_INTERVAL = 2.0
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler zapisujący przez duży bufor.
+    
+    Zamiast opróżniania po każdym rekordzie bufor trafia na dysk przy rekordzie
+    od poziomu LOG_FLUSH_LEVEL, najpóźniej LOG_FLUSH_INTERVAL sekund po
+    pierwszym niezapisanym rekordzie oraz przy zamknięciu.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._flush_timer = None
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_FILE_BUFSIZE,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def flush(self):
+        # StreamHandler.emit wywołuje flush() po każdym rekordzie - o zapisie decyduje emit()
+        pass
+    
+    def _flush_now(self):
+        """Zapisuje bufor na dysk i kasuje zaplanowany zapis."""
+        self.acquire()
+        try:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self.stream:
+                self.stream.flush()
+        finally:
+            self.release()
+    
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= LOG_FLUSH_LEVEL:
+            self._flush_now()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(LOG_FLUSH_INTERVAL, self._flush_now)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def close(self):
+        self._flush_now()
+        super().close()
+
+# Konfiguracja loggera - rekordy trafiają do kolejki, a zapisuje je wątek QueueListener
+_log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+_log_handlers = [_BufferedFileHandler("build.log", encoding="utf-8"), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# QueueHandler wstawia do kolejki samą treść - format (czas, poziom) nadają handlery listenera
+logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.handlers.QueueHandler(_log_queue)])
 logger = logging.getLogger("build")
 
+# Minimalna liczba wątków wspólnej puli (kopiowanie plików przeglądarki to głównie I/O)
+COPY_WORKERS = 8
+
+# Wspólna pula wątków dla kopiowania plików i zadań w tle przy instalacji przeglądarki
+# (wątki powstają dopiero przy pierwszym zadaniu)
+_EXECUTOR = ThreadPoolExecutor(max_workers=max(COPY_WORKERS, os.cpu_count() or 1))
+atexit.register(_EXECUTOR.shutdown)
+
+# Rozmiar bufora pętli odczytu/zapisu, gdy jądro nie kopiuje pliku samo
+LINUX_COPY_BUFSIZE = 256 * 1024
+
+# Numer ioctl FICLONE (linux/fs.h) - kopia CoW współdzieląca bloki z plikiem źródłowym
+LINUX_FICLONE = 0x40049409
+
+# Plik .spec PyInstaller z konfiguracją buildu
+SPEC_FILE = f"{APP_NAME}.spec"
+
+# Ścieżki buildu (względem katalogu roboczego) - wyznaczane raz przy imporcie
+ICON_PATH = Path("app", "resources", "icon.ico")
+BUILD_DIR = Path("build")
+DIST_DIR = Path("dist")
+# Build typu onedir - katalog aplikacji ma tę samą postać na każdym systemie
+APP_DIR = DIST_DIR / APP_NAME
+APP_EXE = APP_DIR / (f"{APP_NAME}.exe" if os.name == 'nt' else APP_NAME)
+DRIVER_DIR = APP_DIR / "_internal" / "playwright" / "driver"
+LOCAL_BROWSERS_DIR = DRIVER_DIR / "package" / ".local-browsers"
+
+# Ścieżka chrome.exe względem katalogu chromium-* (łączona raz, nie dla każdego wpisu)
+CHROME_EXE_SUFFIX = f"{os.sep}chrome-win{os.sep}chrome.exe"
+
+def _scan_chromium_dir(base_dir, label):
+    """Szuka katalogu chromium-* z chrome-win/chrome.exe w katalogu ms-playwright (jedno os.scandir)."""
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith("chromium-") and entry.is_dir():
+                chrome_exe = f"{entry.path}{CHROME_EXE_SUFFIX}"
+                
+                if os.access(chrome_exe, os.F_OK):
+                    logger.info(f"Znaleziono chrome.exe w {label}: {chrome_exe}")
+                    return entry.name, entry.path
+    return None, None
+
+@functools.lru_cache(maxsize=1)
 def find_system_browser_path():
-    """Znajduje ścieżkę do przeglądarki w systemie."""
+    """
+    Znajduje ścieżkę do przeglądarki w systemie.
+    
+    Wynik jest zapamiętywany - build i późniejsza próba kopiowania w __main__
+    korzystają z jednego przeszukania katalogów.
+    """
     try:
         # Standardowa ścieżka cache Playwright
         cache_dir = Path.home() / ".cache" / "ms-playwright"
-        if cache_dir.exists():
+        if cache_dir.is_dir():
             logger.info(f"Znaleziono katalog cache ms-playwright: {cache_dir}")
-            for item in os.listdir(cache_dir):
-                if item.startswith("chromium-"):
-                    chrome_win_dir = os.path.join(cache_dir, item, "chrome-win")
-                    chrome_exe = os.path.join(chrome_win_dir, "chrome.exe")
-                    
-                    if os.path.exists(chrome_exe):
-                        logger.info(f"Znaleziono chrome.exe w systemowym katalogu cache: {chrome_exe}")
-                        return item, os.path.join(cache_dir, item)
+            found = _scan_chromium_dir(cache_dir, "systemowym katalogu cache")
+            if found[0]:
+                return found
         
         # Ścieżka w AppData dla Windows
         if os.name == 'nt':
             appdata_path = Path(os.environ.get('LOCALAPPDATA', '')) / "ms-playwright"
-            if appdata_path.exists():
+            if appdata_path.is_dir():
                 logger.info(f"Znaleziono katalog AppData ms-playwright: {appdata_path}")
-                for item in os.listdir(appdata_path):
-                    if item.startswith("chromium-"):
-                        chrome_win_dir = os.path.join(appdata_path, item, "chrome-win")
-                        chrome_exe = os.path.join(chrome_win_dir, "chrome.exe")
-                        
-                        if os.path.exists(chrome_exe):
-                            logger.info(f"Znaleziono chrome.exe w AppData: {chrome_exe}")
-                            return item, os.path.join(appdata_path, item)
+                found = _scan_chromium_dir(appdata_path, "AppData")
+                if found[0]:
+                    return found
         
         return None, None
     except Exception as e:
         logger.error(f"Błąd podczas szukania przeglądarki: {e}")
         return None, None
 
+def _native_copy(src, dst):
+    """
+    Kopiuje plik natywnym mechanizmem systemu.
+    
+    Najpierw próbuje utworzyć twarde dowiązanie (ten sam system plików - bez
+    kopiowania danych), na Linux następnie kopię CoW przez ioctl FICLONE.
+    Dopiero potem kopiuje dane: na Windows przez CopyFileW (kopiowanie w jądrze
+    zamiast pętli odczytu/zapisu w Pythonie), na Linux copy_file_range/sendfile,
+    na innych systemach shutil.copyfile; poza Windows kopiowane są też
+    uprawnienia (np. bit wykonywania).
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    
+    if os.name == 'nt':
+        import ctypes
+        if not ctypes.windll.kernel32.CopyFileW(ctypes.c_wchar_p(str(src)), ctypes.c_wchar_p(str(dst)), False):
+            raise ctypes.WinError()
+    elif sys.platform.startswith("linux"):
+        if not _linux_reflink(src, dst):
+            _linux_copy(src, dst)
+        shutil.copymode(src, dst)
+    else:
+        shutil.copyfile(src, dst)
+        shutil.copymode(src, dst)
+
+def _linux_reflink(src, dst):
+    """Tworzy kopię CoW pliku (ioctl FICLONE, np. Btrfs/XFS); zwraca False, gdy system plików jej nie obsługuje."""
+    import fcntl
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            fcntl.ioctl(dst_fd, LINUX_FICLONE, src_fd)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+def _linux_copy(src, dst):
+    """
+    Kopiuje plik w jądrze Linux na surowych deskryptorach.
+    
+    Najpierw os.copy_file_range (na Btrfs/XFS może utworzyć kopię CoW bez
+    przepisywania danych), potem os.sendfile, a na końcu zwykła pętla
+    odczytu/zapisu - każda kolejna metoda kontynuuje od miejsca, w którym
+    poprzednia przerwała.
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            offset = 0
+            
+            copy_file_range = getattr(os, "copy_file_range", None)
+            if copy_file_range is not None:
+                try:
+                    while offset < size:
+                        copied = copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                except OSError:
+                    pass
+            
+            if offset < size:
+                try:
+                    while offset < size:
+                        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except OSError:
+                    pass
+            
+            if offset < size:
+                os.lseek(src_fd, offset, os.SEEK_SET)
+                os.lseek(dst_fd, offset, os.SEEK_SET)
+                while True:
+                    chunk = os.read(src_fd, LINUX_COPY_BUFSIZE)
+                    if not chunk:
+                        break
+                    os.write(dst_fd, chunk)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+def _fast_copytree(src, dst):
+    """
+    Kopiuje drzewo katalogów równolegle.
+    
+    Drzewo jest najpierw przeglądane przez os.scandir (typ wpisu bez dodatkowego
+    stat), potem wszystkie katalogi są tworzone jednym przebiegiem (od góry,
+    więc wystarcza jedno os.mkdir na katalog), a dopiero na końcu pliki są
+    kopiowane we wspólnej puli wątków. Pierwszy błąd kopiowania jest zgłaszany po
+    zakończeniu wszystkich zadań.
+    
+    Dowiązania symboliczne są rozwiązywane (kopiowana jest ich zawartość, jak w
+    shutil.copytree), bo dowiązanie bezwzględne lub wychodzące poza drzewo
+    przestałoby działać w przeniesionej aplikacji.
+    """
+    dirs = [dst]
+    files = []
+    # Katalogi osiągnięte przez dowiązania - ochrona przed pętlą dowiązań
+    linked_dirs = {os.path.realpath(src)}
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    if entry.is_symlink():
+                        real_dir = os.path.realpath(entry.path)
+                        if real_dir in linked_dirs:
+                            continue
+                        linked_dirs.add(real_dir)
+                    dirs.append(target)
+                    stack.append((entry.path, target))
+                elif entry.is_file():
+                    # os.link nie rozwiązuje dowiązań, więc kopiujemy plik docelowy
+                    file_src = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                    files.append((file_src, target))
+                else:
+                    logger.warning(f"Pomijam nieprawidłowe dowiązanie: {entry.path}")
+    
+    os.makedirs(dst, exist_ok=True)
+    for dst_dir in dirs[1:]:
+        try:
+            os.mkdir(dst_dir)
+        except FileExistsError:
+            pass
+    
+    futures = [_EXECUTOR.submit(_native_copy, file_src, target) for file_src, target in files]
+    for future in futures:
+        future.result()
+
+def _tree_size(path):
+    """Sumuje rozmiar plików w drzewie katalogów (os.scandir - rozmiar z wpisu katalogu bez osobnego otwierania plików)."""
+    total = 0
+    stack = [path]
+    linked_dirs = {os.path.realpath(path)}
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.is_symlink():
+                        real_dir = os.path.realpath(entry.path)
+                        if real_dir in linked_dirs:
+                            continue
+                        linked_dirs.add(real_dir)
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    total += entry.stat().st_size
+    return total
+
+def _can_hardlink(source_dir, target_dir):
+    """Sprawdza próbnym os.link jednego pliku, czy pliki ze źródła da się dowiązać w katalogu docelowym."""
+    sample = next((os.path.join(root, name) for root, _, names in os.walk(source_dir) for name in names), None)
+    if sample is None:
+        return False
+    probe = os.path.join(target_dir, f".link-probe-{os.getpid()}")
+    try:
+        os.link(os.path.realpath(sample), probe)
+    except OSError:
+        return False
+    os.remove(probe)
+    return True
+
+def _has_space_for_copy(source_dir, target_dir):
+    """
+    Sprawdza przed kopiowaniem, czy na dysku docelowym zmieści się drzewo źródłowe.
+    
+    Sprawdzenie jest pomijane tylko wtedy, gdy próbne twarde dowiązanie się
+    powiedzie (pliki nie zajmą miejsca) - sam wspólny system plików nie
+    wystarcza, bo dowiązania mogą być niedozwolone i _native_copy skopiuje dane.
+    """
+    if _can_hardlink(source_dir, target_dir):
+        return True
+    required = _tree_size(source_dir)
+    free = shutil.disk_usage(target_dir).free
+    if required > free * 0.95:
+        logger.error(f"Za mało miejsca na dysku: potrzeba {required // (1024 * 1024)} MB, "
+                     f"wolne {free // (1024 * 1024)} MB w {target_dir}")
+        return False
+    return True
+
 def copy_browser_to_build(chromium_version, source_dir, target_dir):
     """Kopiuje przeglądarkę do katalogu buildu."""
     try:
@@ -67,11 +368,15 @@ def copy_browser_to_build(chromium_version, source_dir, target_dir):
         # Utwórz katalog docelowy
         os.makedirs(target_dir, exist_ok=True)
         
+        # Nie zaczynaj kopiowania, które i tak zapełni dysk w połowie
+        if not _has_space_for_copy(source_dir, target_dir):
+            return False
+        
         # Kopiuj przeglądarkę
-        shutil.copytree(source_dir, os.path.join(target_dir, chromium_version), dirs_exist_ok=True)
+        _fast_copytree(source_dir, os.path.join(target_dir, chromium_version))
         
         # Sprawdź czy kopiowanie się powiodło
-        chrome_exe = os.path.join(target_dir, chromium_version, "chrome-win", "chrome.exe")
+        chrome_exe = f"{os.path.join(target_dir, chromium_version)}{CHROME_EXE_SUFFIX}"
         if os.path.exists(chrome_exe):
             logger.info(f"Przeglądarka skopiowana pomyślnie: {chrome_exe}")
             return True
@@ -82,40 +387,70 @@ def copy_browser_to_build(chromium_version, source_dir, target_dir):
         logger.error(f"Błąd podczas kopiowania przeglądarki: {e}")
         return False
 
-def build_executable():
-    """Buduje plik wykonywalny za pomocą PyInstaller."""
-    logger.info("Rozpoczynam proces budowania pliku wykonywalnego...")
+def _run_streamed(cmd):
+    """
+    Uruchamia proces i na bieżąco przekazuje jego wyjście (stdout i stderr) do loggera.
     
-    # Upewnij się, że PyInstaller jest zainstalowany w najnowszej wersji
-    try:
-        import PyInstaller
-        logger.info(f"Znaleziono PyInstaller w wersji {PyInstaller.__version__}")
-        # Aktualizuj PyInstaller do najnowszej wersji
-        subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", "pyinstaller"], check=True)
-        logger.info("Zaktualizowano PyInstaller do najnowszej wersji")
-    except ImportError:
-        logger.info("Instaluję PyInstaller...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
-    
-    # Upewnij się, że wszystkie wymagane pakiety są zainstalowane
-    logger.info("Instaluję/aktualizuję wszystkie wymagane pakiety...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "--upgrade"], check=True)
-    
-    # Upewnij się, że ipaddress jest zainstalowany (czasem jest problematyczny)
-    subprocess.run([sys.executable, "-m", "pip", "install", "ipaddress"], check=True)
-    
-    # Zainstaluj Playwright i przeglądarki
-    logger.info("Instaluję Playwright i przeglądarki...")
+    Wyjście jest czytane w trakcie działania procesu, więc potok nigdy się nie
+    zapełnia. Przy niezerowym kodzie wyjścia zgłasza CalledProcessError - tak jak
+    subprocess.run(check=True).
+    """
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          bufsize=1, text=True, encoding="utf-8", errors="replace") as process:
+        for line in process.stdout:
+            logger.info(line.rstrip())
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+
+def _install_system_chromium():
+    """
+    Instaluje Chromium dla Playwright (pakiet playwright pochodzi z requirements.txt)
+    i zwraca (wersja, ścieżka) przeglądarki znalezionej w systemie.
+    """
+    logger.info("Instaluję przeglądarkę Chromium dla Playwright...")
     try:
-        subprocess.run([sys.executable, "-m", "pip", "install", "playwright"], check=True)
-        subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
-        logger.info("Playwright i Chromium zainstalowane pomyślnie")
+        _run_streamed([sys.executable, "-m", "playwright", "install", "chromium"])
+        logger.info("Chromium dla Playwright zainstalowany pomyślnie")
     except subprocess.CalledProcessError as e:
         logger.error(f"Błąd podczas instalacji Playwright: {e}")
         logger.info("Kontynuuję budowanie mimo to...")
     
+    # Wyszukiwanie dopiero po instalacji - wynik find_system_browser_path jest zapamiętywany
+    return find_system_browser_path()
+
+def build_executable(clean=False, debug=False):
+    """
+    Buduje plik wykonywalny za pomocą PyInstaller.
+    
+    Katalog build/ z wynikami analizy PyInstaller jest zachowywany między buildami;
+    clean=True usuwa go i wymusza pełną analizę od nowa. debug=True włącza
+    szczegółowe logi PyInstaller.
+    
+    Zwraca True, jeśli przeglądarka została już skopiowana do zbudowanej aplikacji.
+    """
+    logger.info("Rozpoczynam proces budowania pliku wykonywalnego...")
+    
+    # PyInstaller i pakiety z requirements.txt instalujemy tylko, gdy zmieniły się
+    # wymagania (lub interpreter) od ostatniego udanego buildu
+    requirements_hash = requirements_fingerprint()
+    if read_requirements_stamp() == requirements_hash:
+        logger.info("Wymagania nie zmieniły się od ostatniego buildu - pomijam instalację pakietów")
+    else:
+        # PyInstaller i wszystkie wymagane pakiety (w tym playwright) jednym wywołaniem pip
+        logger.info("Instaluję/aktualizuję PyInstaller i wszystkie wymagane pakiety...")
+        subprocess.run(
+            [sys.executable, "-m", "pip", "install", "--upgrade", "pyinstaller", "-r", "requirements.txt"],
+            check=True
+        )
+        
+        # Instalacja mogła zmienić wersję PyInstaller, więc skrót liczymy ponownie
+        try:
+            write_requirements_stamp(requirements_fingerprint())
+        except OSError as e:
+            logger.warning(f"Nie udało się zapisać znacznika wymagań: {e}")
+    
     # Upewnij się, że mamy wygenerowaną ikonę
-    if not os.path.exists("app/resources/icon.ico"):
+    if not ICON_PATH.exists():
         logger.info("Generuję ikonę aplikacji...")
         try:
             import generate_icon
@@ -124,8 +459,10 @@ def build_executable():
             logger.error(f"Błąd podczas generowania ikony: {e}")
             logger.info("Kontynuuję bez ikony...")
     
-    # Próba usunięcia poprzednich buildów, ale pomiń jeśli są błędy
-    for dir_name in ["build", "dist"]:
+    # Próba usunięcia poprzedniej dystrybucji, ale pomiń jeśli są błędy. Katalog build
+    # zostaje (chyba że clean=True) - PyInstaller ponownie używa z niego wyników
+    # analizy, jeśli wejście się nie zmieniło
+    for dir_name in ([BUILD_DIR, DIST_DIR] if clean else [DIST_DIR]):
         if os.path.exists(dir_name):
             logger.info(f"Próbuję usunąć poprzedni katalog {dir_name}...")
             try:
@@ -135,80 +472,34 @@ def build_executable():
                 logger.error(f"Nie udało się usunąć katalogu {dir_name}: {e}")
                 logger.info(f"Kontynuuję budowanie bez usuwania {dir_name}...")
     
-    # Określ separator ścieżek dla systemu operacyjnego
-    separator = ";" if platform.system() == "Windows" else ":"
+    # Ostrzeżenia z poprzedniego buildu są nieaktualne - usuń je, żeby nie mylić ich z bieżącymi
+    for warn_file in BUILD_DIR.glob("*/warn-*.txt"):
+        try:
+            warn_file.unlink()
+        except OSError as e:
+            logger.warning(f"Nie udało się usunąć {warn_file}: {e}")
     
     # Upewnij się, że katalog config istnieje
     os.makedirs("config", exist_ok=True)
     
-    # Znajdź ścieżkę do przeglądarki w systemie - będzie potrzebna później do kopiowania
-    chromium_version, chromium_path = find_system_browser_path()
-    logger.info(f"Wykryty Chromium: wersja={chromium_version}, ścieżka={chromium_path}")
-    
-    # Lista dodatkowych modułów do włączenia
-    hidden_imports = [
-        "ipaddress",
-        "collections.abc",
-        "PyQt6",
-        "PyQt6.QtWidgets",
-        "PyQt6.QtCore", 
-        "PyQt6.QtGui",
-        "PyQt6.sip",
-        "playwright",
-        "pathlib",
-        "urllib.parse",
-        "xml.etree.ElementTree",
-        "logging",
-        "json",
-        "ssl",
-        "asyncio",
-        "nest_asyncio",
-        "email.mime.multipart",
-        "email.mime.text",
-        "email.mime.application",
-        "subprocess",
-        "importlib",
-        "importlib.util",
-        "pkg_resources.py2_warn",
-        "pkg_resources._vendor.appdirs",
-        "pkg_resources._vendor.packaging",
-        "pkg_resources._vendor.pyparsing",
-        "dill",
-        "websockets.client",
-        "websockets.connection",
-        "websockets.protocol",
-        "_bootlocale",
-        "urllib.error",
-        "encodings",
-        "encodings.idna",
-        "encodings.utf_8",
-        "encodings.ascii"
-    ]
-    
-    hidden_imports_args = [f"--hidden-import={imp}" for imp in hidden_imports]
+    # Pobieranie Chromium (sieć) i wyszukanie go w systemie - potrzebne później do
+    # kopiowania - działają w tle, równolegle z analizą PyInstaller (CPU)
+    system_browser = _EXECUTOR.submit(_install_system_chromium)
     
-    # Uruchom PyInstaller z odpowiednimi parametrami
+    # Uruchom PyInstaller z plikiem .spec (ukryte importy, wykluczenia, ikona i dane
+    # są w SPEC_FILE, a listy modułów w build_config.py)
     cmd = [
         sys.executable, "-m", "PyInstaller",
-        "--name=Fakturator_e-urtica",
         "--noconfirm",
-        "--clean",
-        "--distpath=dist",
-        "--workpath=build",
-        f"--icon={os.path.abspath('app/resources/icon.ico')}",
-        "--runtime-hook=scripts/runtime_hook.py",
-        "--windowed",
-        "--noconsole",
-        "app/main.py",
-        f"--add-data=config/{separator}config/",
-        f"--add-data=app/resources/{separator}app/resources/",
+        f"--distpath={DIST_DIR}",
+        f"--workpath={BUILD_DIR}",
+        SPEC_FILE,
     ]
+    if clean:
+        cmd.append("--clean")
     
-    # Dodaj ukryte importy
-    cmd.extend(hidden_imports_args)
-    
-    # Dodaj dodatkowe opcje
-    cmd.append("--log-level=DEBUG")  # Więcej informacji diagnostycznych
+    # Szczegółowe logi PyInstaller tylko w trybie debug - tysiące linii spowalniają build
+    cmd.append(f"--log-level={'DEBUG' if debug else 'WARN'}")
     
     # Upewnij się, że katalog scripts istnieje
     os.makedirs("scripts", exist_ok=True)
@@ -216,120 +507,98 @@ def build_executable():
     logger.info("Uruchamiam PyInstaller z komendą:")
     logger.info(" ".join(cmd))
     
+    browser_copied = False
     try:
-        result = subprocess.run(cmd, check=True)
+        _run_streamed(cmd)
         
-        if result.returncode == 0:
-            logger.info("\nBudowanie zakończone pomyślnie!")
-            
-            # Określ ścieżkę do pliku wykonywalnego
-            if platform.system() == "Windows":
-                exe_path = os.path.join("dist", "Fakturator_e-urtica.exe")
-                app_dir = os.path.join("dist", "Fakturator_e-urtica")
-            elif platform.system() == "Darwin":  # macOS
-                exe_path = os.path.join("dist", "Fakturator_e-urtica.app")
-                app_dir = exe_path
-            else:  # Linux
-                exe_path = os.path.join("dist", "Fakturator_e-urtica")
-                app_dir = exe_path
-            
-            logger.info(f"\nPlik wykonywalny został utworzony w: {os.path.abspath(exe_path)}")
+        logger.info("\nBudowanie zakończone pomyślnie!")
+        
+        chromium_version, chromium_path = system_browser.result()
+        logger.info(f"Wykryty Chromium: wersja={chromium_version}, ścieżka={chromium_path}")
+        
+        logger.info(f"\nPlik wykonywalny został utworzony w: {APP_EXE.resolve()}")
+        
+        # Kopiowanie przeglądarki z systemu
+        if chromium_version and chromium_path:
+            logger.info(f"Kopiowanie przeglądarki do: {LOCAL_BROWSERS_DIR}")
+            os.makedirs(LOCAL_BROWSERS_DIR, exist_ok=True)
             
-            # Kopiowanie przeglądarki z systemu
-            if chromium_version and chromium_path:
-                internal_path = os.path.join(app_dir, "_internal")
-                playwright_path = os.path.join(internal_path, "playwright")
-                driver_path = os.path.join(playwright_path, "driver")
-                package_path = os.path.join(driver_path, "package")
-                browsers_path = os.path.join(package_path, ".local-browsers")
-                
-                logger.info(f"Kopiowanie przeglądarki do: {browsers_path}")
-                os.makedirs(browsers_path, exist_ok=True)
-                
-                # Kopiuj przeglądarkę
-                if copy_browser_to_build(chromium_version, chromium_path, browsers_path):
-                    logger.info("Przeglądarka skopiowana pomyślnie do dystrybucji")
-                else:
-                    logger.error("Błąd podczas kopiowania przeglądarki do dystrybucji")
+            # Kopiuj przeglądarkę
+            if copy_browser_to_build(chromium_version, chromium_path, LOCAL_BROWSERS_DIR):
+                logger.info("Przeglądarka skopiowana pomyślnie do dystrybucji")
+                browser_copied = True
             else:
-                logger.warning("Nie znaleziono przeglądarki w systemie do skopiowania")
-            
-            logger.info("\nAby uruchomić aplikację, po prostu kliknij na plik wykonywalny.")
+                logger.error("Błąd podczas kopiowania przeglądarki do dystrybucji")
         else:
-            logger.error("\nBłąd podczas budowania pliku wykonywalnego!")
+            logger.warning("Nie znaleziono przeglądarki w systemie do skopiowania")
+        
+        logger.info("\nAby uruchomić aplikację, po prostu kliknij na plik wykonywalny.")
     except subprocess.CalledProcessError as e:
         logger.error(f"\n❌ Błąd podczas budowania aplikacji: {e}")
+    
+    return browser_copied
 
-if __name__ == "__main__":
-    build_executable()
+def _install_browser_into_build():
+    """
+    Instaluje Chromium w zbudowanej aplikacji, a gdy się nie uda - kopiuje go z systemu.
     
-    # Próba automatycznej instalacji przeglądarek Playwright w zbudowanej aplikacji
-    logger.info("\nPróbuję zainstalować przeglądarki Playwright w zbudowanej aplikacji...")
+    Instalacja przez Playwright CLI z aplikacji działa w osobnym procesie, a w tym
+    czasie w tle wyszukiwana jest systemowa przeglądarka potrzebna do kopiowania.
+    """
+    node_exe = DRIVER_DIR / "node.exe"
+    cli_js = DRIVER_DIR / "package" / "cli.js"
     
-    try:
-        import platform
-        import os
-        import subprocess
-        
-        # Określ ścieżkę do pliku wykonywalnego
-        if platform.system() == "Windows":
-            exe_path = os.path.abspath(os.path.join("dist", "Fakturator_e-urtica"))
-        else:
-            exe_path = os.path.abspath(os.path.join("dist", "Fakturator_e-urtica"))
+    # Utwórz katalog .local-browsers jeśli nie istnieje
+    os.makedirs(LOCAL_BROWSERS_DIR, exist_ok=True)
+    
+    # Systemowa przeglądarka jest szukana równolegle z instalacją przez CLI
+    system_browser = _EXECUTOR.submit(find_system_browser_path)
+    
+    node_exists = node_exe.exists()
+    cli_exists = cli_js.exists()
+    if node_exists and cli_exists:
+        # Uruchom instalację przeglądarki
+        logger.info("Uruchamiam instalację przeglądarki Chromium...")
+        process = subprocess.Popen([node_exe, cli_js, "install", "chromium"])
+        if process.wait() == 0:
+            logger.info("\n✅ Pomyślnie zainstalowano przeglądarkę Chromium w zbudowanej aplikacji!")
+            return True
+        logger.warning("\n❌ Nie udało się zainstalować przeglądarki Chromium przez Playwright CLI.")
+        logger.info("Sprawdzanie systemu pod kątem przeglądarek do skopiowania...")
+    else:
+        logger.warning("\n❌ Nie znaleziono plików Playwright w zbudowanej aplikacji.")
+        logger.warning(f"node.exe istnieje: {node_exists}")
+        logger.warning(f"cli.js istnieje: {cli_exists}")
+    
+    chromium_version, chromium_path = system_browser.result()
+    
+    # Alternatywne podejście - kopiuj z systemowego katalogu
+    if not (chromium_version and chromium_path):
+        logger.error("\n❌ Nie znaleziono przeglądarki Chromium w systemie.")
+        return False
+    if copy_browser_to_build(chromium_version, chromium_path, LOCAL_BROWSERS_DIR):
+        logger.info("\n✅ Pomyślnie skopiowano przeglądarkę Chromium z systemu!")
+        return True
+    logger.error("\n❌ Nie udało się skopiować przeglądarki z systemu.")
+    return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Budowanie pliku wykonywalnego Fakturator e-urtica")
+    parser.add_argument("--force-clean", action="store_true",
+                        help="Usuń katalog build i wymuś pełną analizę PyInstaller")
+    parser.add_argument("--debug", action="store_true",
+                        help="Szczegółowe logi PyInstaller (--log-level=DEBUG)")
+    args = parser.parse_args()
+    
+    # Przeglądarka skopiowana już w build_executable() nie jest instalowana/kopiowana drugi raz
+    if not build_executable(clean=args.force_clean, debug=args.debug):
+        # Próba automatycznej instalacji przeglądarek Playwright w zbudowanej aplikacji
+        logger.info("\nPróbuję zainstalować przeglądarki Playwright w zbudowanej aplikacji...")
         
-        if not os.path.exists(exe_path):
-            logger.warning(f"Nie znaleziono katalogu aplikacji: {exe_path}")
-        else:
-            # Znajdź ścieżkę do node.exe i playwright CLI
-            node_exe = os.path.join(exe_path, "_internal", "playwright", "driver", "node.exe")
-            cli_js = os.path.join(exe_path, "_internal", "playwright", "driver", "package", "cli.js")
-            
-            if os.path.exists(node_exe) and os.path.exists(cli_js):
-                # Utwórz katalog .local-browsers jeśli nie istnieje
-                local_browsers_dir = os.path.join(exe_path, "_internal", "playwright", "driver", "package", ".local-browsers")
-                os.makedirs(local_browsers_dir, exist_ok=True)
-                
-                # Uruchom instalację przeglądarki
-                logger.info(f"Uruchamiam instalację przeglądarki Chromium...")
-                cmd = [node_exe, cli_js, "install", "chromium"]
-                result = subprocess.run(cmd, check=False)
-                
-                if result.returncode == 0:
-                    logger.info("\n✅ Pomyślnie zainstalowano przeglądarkę Chromium w zbudowanej aplikacji!")
-                else:
-                    logger.warning("\n❌ Nie udało się zainstalować przeglądarki Chromium przez Playwright CLI.")
-                    logger.info("Sprawdzanie systemu pod kątem przeglądarek do skopiowania...")
-                    
-                    # Alternatywne podejście - kopiuj z systemowego katalogu
-                    chromium_version, chromium_path = find_system_browser_path()
-                    if chromium_version and chromium_path:
-                        if copy_browser_to_build(chromium_version, chromium_path, local_browsers_dir):
-                            logger.info("\n✅ Pomyślnie skopiowano przeglądarkę Chromium z systemu!")
-                        else:
-                            logger.error("\n❌ Nie udało się skopiować przeglądarki z systemu.")
-                    else:
-                        logger.error("\n❌ Nie znaleziono przeglądarki Chromium w systemie.")
+        try:
+            if not APP_DIR.exists():
+                logger.warning(f"Nie znaleziono katalogu aplikacji: {APP_DIR.resolve()}")
             else:
-                logger.warning(f"\n❌ Nie znaleziono plików Playwright w zbudowanej aplikacji.")
-                logger.warning(f"node.exe istnieje: {os.path.exists(node_exe)}")
-                logger.warning(f"cli.js istnieje: {os.path.exists(cli_js)}")
-                
-                # Alternatywne podejście - utwórz ścieżki ręcznie
-                internal_path = os.path.join(exe_path, "_internal")
-                playwright_path = os.path.join(internal_path, "playwright")
-                driver_path = os.path.join(playwright_path, "driver")
-                package_path = os.path.join(driver_path, "package")
-                local_browsers_dir = os.path.join(package_path, ".local-browsers")
-                
-                # Utwórz katalogi
-                os.makedirs(local_browsers_dir, exist_ok=True)
-                
-                # Kopiuj z systemu
-                chromium_version, chromium_path = find_system_browser_path()
-                if chromium_version and chromium_path:
-                    if copy_browser_to_build(chromium_version, chromium_path, local_browsers_dir):
-                        logger.info("\n✅ Pomyślnie skopiowano przeglądarkę Chromium z systemu do ręcznie utworzonego katalogu!")
-                    else:
-                        logger.error("\n❌ Nie udało się skopiować przeglądarki z systemu do ręcznie utworzonego katalogu.")
-    except Exception as e:
-        logger.error(f"\n❌ Wystąpił błąd podczas instalacji przeglądarek Playwright: {e}") 
\ No newline at end of file
+                _install_browser_into_build()
+        except Exception as e:
+            logger.error(f"\n❌ Wystąpił błąd podczas instalacji przeglądarek Playwright: {e}")
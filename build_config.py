@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Wspólna konfiguracja PyInstaller używana przez build.py, scripts/build_app.py i Fakturator_e-urtica.spec."""
+
+import hashlib
+import importlib.metadata
+import sys
+from pathlib import Path
+
+# Nazwa aplikacji (katalog w dist/ i plik wykonywalny)
+APP_NAME = "Fakturator_e-urtica"
+
+# Moduły, których PyInstaller nie wykrywa analizą importów (reszta jest wykrywana
+# automatycznie, a playwright i websockets są dołączane przez COLLECT_SUBMODULES)
+HIDDEN_IMPORTS = (
+    "PyQt6.sip",
+    "encodings.idna",
+)
+
+# Pakiety dołączane w całości (ładowane dynamicznie przez sterownik Playwright)
+COLLECT_SUBMODULES = ("playwright", "websockets")
+
+# Moduły biblioteki standardowej i Qt zbędne w aplikacji (używa tylko QtCore/QtGui/QtWidgets)
+# - mniejszy build i mniej danych do wczytania przy starcie
+EXCLUDED_MODULES = (
+    "tkinter", "test", "unittest", "pydoc_data", "distutils",
+    "PyQt6.QtQml", "PyQt6.QtQuick", "PyQt6.QtQuick3D", "PyQt6.Qt3DCore",
+    "PyQt6.QtWebEngineCore", "PyQt6.QtWebEngineWidgets", "PyQt6.QtMultimedia",
+)
+
+# Usuwanie symboli z bibliotek (strip) tylko na Linux - na Windows nie ma narzędzia,
+# a na macOS unieważnia podpisy bibliotek
+STRIP_BINARIES = sys.platform.startswith("linux")
+
+# Znacznik ostatnio zainstalowanych wymagań - wspólny dla build.py i scripts/build_app.py
+# (poza build/, który PyInstaller może wyczyścić przy --clean)
+REQUIREMENTS_STAMP = Path(".build_cache") / "requirements.sha256"
+
+def installed_pyinstaller_version():
+    """Zwraca wersję zainstalowanego PyInstaller (bez jego importowania) lub None."""
+    try:
+        return importlib.metadata.version("pyinstaller")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+def requirements_fingerprint():
+    """
+    Zwraca skrót SHA-256 pliku requirements.txt, ścieżki interpretera i wersji PyInstaller.
+    
+    Ręczna zmiana lub usunięcie PyInstaller zmienia skrót, więc pakiety zostaną
+    ponownie zainstalowane przy następnym buildzie.
+    """
+    digest = hashlib.sha256(sys.executable.encode("utf-8"))
+    digest.update(str(installed_pyinstaller_version()).encode("utf-8"))
+    with open("requirements.txt", "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+def read_requirements_stamp():
+    """Odczytuje skrót wymagań zapisany po ostatniej instalacji pakietów (lub None)."""
+    try:
+        return REQUIREMENTS_STAMP.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+def write_requirements_stamp(requirements_hash):
+    """Zapisuje skrót wymagań po udanej instalacji pakietów (OSError zgłasza wywołującemu)."""
+    REQUIREMENTS_STAMP.parent.mkdir(parents=True, exist_ok=True)
+    REQUIREMENTS_STAMP.write_text(requirements_hash, encoding="utf-8")
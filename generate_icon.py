@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from PIL import Image, ImageDraw, ImageFont
 import os
 
+# Rozmiary zapisywane w jednym pliku .ico (Windows wybiera gotowy zamiast skalować)
+ICO_SIZES = [(256, 256), (128, 128), (64, 64), (32, 32), (16, 16)]
+
 def generate_app_icon():
     """Generuje ikonę aplikacji i zapisuje w folderze app/resources."""
+    # PIL importowany dopiero tutaj - samo `import generate_icon` nie ładuje rozszerzeń C
+    from PIL import Image, ImageDraw, ImageFont
+    
     # Utwórz pusty obraz 256x256 pikseli z przezroczystym tłem
     img = Image.new('RGBA', (256, 256), color=(0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -30,8 +35,8 @@ def generate_app_icon():
     
     img.save(os.path.join(resources_dir, "icon.png"))
     
-    # Zapisz również jako icon.ico dla Windows
-    img.save(os.path.join(resources_dir, "icon.ico"))
+    # Zapisz również jako icon.ico dla Windows - wszystkie rozmiary w jednym przebiegu
+    img.save(os.path.join(resources_dir, "icon.ico"), format="ICO", sizes=ICO_SIZES)
     
     print(f"Ikona została wygenerowana i zapisana w {resources_dir}")
 
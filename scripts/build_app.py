@@ -3,115 +3,130 @@
 
 import os
 import sys
+import argparse
+import importlib.metadata
 import shutil
 import subprocess
 from pathlib import Path
 
+# Katalog główny projektu i ikona aplikacji (niezależnie od katalogu roboczego)
+ROOT = Path(__file__).resolve().parent.parent
+ICON_PATH = ROOT / "app" / "resources" / "icon.ico"
+
+# Listy modułów dla PyInstaller są wspólne z Fakturator_e-urtica.spec (build_config.py w katalogu głównym)
+sys.path.insert(0, str(ROOT))
+from build_config import HIDDEN_IMPORTS, COLLECT_SUBMODULES, EXCLUDED_MODULES, STRIP_BINARIES
+from build_config import (
+    installed_pyinstaller_version, requirements_fingerprint,
+    read_requirements_stamp, write_requirements_stamp,
+)
+
 def create_directory(path):
     """Tworzy katalog, jeśli nie istnieje."""
     os.makedirs(path, exist_ok=True)
 
-def build_executable():
-    """Buduje plik wykonywalny za pomocą PyInstaller."""
-    print("🚀 Budowanie aplikacji...")
+def pip_install_cmd(*args):
+    """
+    Zwraca komendę instalacji pakietów: uv pip, jeśli uv jest dostępne, w przeciwnym razie pip.
     
-    # Upewnij się, że PyInstaller jest zainstalowany w najnowszej wersji
-    try:
-        import PyInstaller
-        print(f"✅ Znaleziono PyInstaller w wersji {PyInstaller.__version__}")
-        # Aktualizuj PyInstaller do najnowszej wersji
-        subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", "pyinstaller"], check=True)
-        print("✅ Zaktualizowano PyInstaller do najnowszej wersji")
-    except ImportError:
-        print("⚠️ Instaluję PyInstaller...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
+    uv instaluje do bieżącego interpretera (--python), tak jak `python -m pip`.
+    """
+    if shutil.which("uv"):
+        return ["uv", "pip", "install", "--python", sys.executable, *args]
+    return [sys.executable, "-m", "pip", "install", *args]
+
+def install_requirements():
+    """
+    Instaluje/aktualizuje PyInstaller i pakiety z requirements.txt.
     
-    # Upewnij się, że wszystkie wymagane pakiety są zainstalowane
-    print("📦 Instaluję/aktualizuję wszystkie wymagane pakiety...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "--upgrade"], check=True)
+    Gdy skrót wymagań (wraz z interpreterem i wersją PyInstaller) nie zmienił się
+    od ostatniej instalacji, pip nie jest w ogóle uruchamiany.
+    """
+    if read_requirements_stamp() == requirements_fingerprint():
+        print("✅ Wymagania nie zmieniły się od ostatniego buildu - pomijam instalację pakietów")
+        return
     
-    # Upewnij się, że ipaddress jest zainstalowany (czasem jest problematyczny)
-    print("📦 Instaluję pakiet ipaddress...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "ipaddress"], check=True)
+    # PyInstaller (w najnowszej wersji) i wszystkie wymagane pakiety jednym wywołaniem -
+    # jeden przebieg resolvera zamiast osobnego dla każdej instalacji
+    pyinstaller_version = installed_pyinstaller_version()
+    if pyinstaller_version:
+        print(f"✅ Znaleziono PyInstaller w wersji {pyinstaller_version}")
+    print("📦 Instaluję/aktualizuję PyInstaller i wszystkie wymagane pakiety...")
+    subprocess.run(pip_install_cmd("--upgrade", "pyinstaller", "-r", "requirements.txt"), check=True)
     
-    # Tworzenie katalogu dla plików tymczasowych
-    build_dir = "build"
-    dist_dir = "dist"
-    create_directory(build_dir)
-    create_directory(dist_dir)
-    
-    # Upewnij się, że katalog scripts istnieje
-    create_directory("scripts")
+    # Instalacja mogła zmienić wersję PyInstaller, więc skrót liczymy ponownie
+    try:
+        write_requirements_stamp(requirements_fingerprint())
+    except OSError as e:
+        print(f"⚠️ Nie udało się zapisać znacznika wymagań: {e}")
+
+def link_or_copy(src, dst):
+    """Tworzy twarde dowiązanie do pliku (bez kopiowania danych), a gdy się nie da - kopiuje plik."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def discover_app_modules(app_dir="app"):
+    """
+    Zwraca nazwy wszystkich modułów z app/**/*.py (np. app.ui.main_window).
     
-    # Utwórz plik runtime_hook.py, który zostanie uruchomiony przy starcie aplikacji
-    runtime_hook_path = os.path.join("scripts", "runtime_hook.py")
-    with open(runtime_hook_path, "w", encoding="utf-8") as f:
-        f.write("""# -*- coding: utf-8 -*-
-# Runtime hook dla PyInstaller
+    Pakiety w app/ nie mają __init__.py, więc zamiast pkgutil.walk_packages
+    drzewo jest przeglądane bezpośrednio.
+    """
+    modules = []
+    for path in sorted(Path(app_dir).rglob("*.py")):
+        parts = path.with_suffix("").parts
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        modules.append(".".join(parts))
+    return modules
 
-import os
-import sys
+def run_streamed(cmd, log_path):
+    """
+    Uruchamia proces, przekazując jego wyjście na bieżąco na konsolę i do pliku log_path
+    (pierwsza linia pliku to uruchomiona komenda).
+    
+    Wyjście (stdout i stderr) jest czytane w trakcie działania procesu, więc potok
+    nigdy się nie zapełnia. Przy niezerowym kodzie wyjścia zgłasza CalledProcessError.
+    """
+    with open(log_path, "w", encoding="utf-8") as log_file, \
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             bufsize=1, text=True, encoding="utf-8", errors="replace") as process:
+        print(*cmd, file=log_file)
+        for line in process.stdout:
+            sys.stdout.write(line)
+            log_file.write(line)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
 
-# Dodaj ścieżkę do katalogu bieżącego na początek sys.path
-if not getattr(sys, 'frozen', False):
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+def is_interactive():
+    """Sprawdza, czy można zadawać pytania użytkownikowi (terminal i nie CI)."""
+    return sys.stdin.isatty() and not os.environ.get("CI")
 
-# Upewnij się, że ipaddress jest dostępny
-try:
-    import ipaddress
-except ImportError:
-    sys.stderr.write("OSTRZEŻENIE: Nie można zaimportować 'ipaddress'. Próba naprawy...\\n")
-    # Dodaj ścieżkę do base_library.zip
-    if hasattr(sys, '_MEIPASS'):
-        sys.path.append(os.path.join(sys._MEIPASS, 'base_library.zip'))
-""")
-    print(f"✅ Utworzono plik runtime hook: {runtime_hook_path}")
+def build_with_pyinstaller(dist_dir, build_dir, clean=False, verbose=False):
+    """Buduje aplikację (katalog dist/Fakturator_e-urtica) za pomocą PyInstaller."""
+    # Plik runtime_hook.py (uruchamiany przy starcie aplikacji) jest w repozytorium -
+    # nie nadpisujemy go przy każdym buildzie
+    runtime_hook_path = os.path.join("scripts", "runtime_hook.py")
+    if not os.path.exists(runtime_hook_path):
+        print(f"❌ Nie znaleziono pliku runtime hook: {runtime_hook_path}")
+        return False
+    print(f"✅ Używam pliku runtime hook: {runtime_hook_path}")
     
     # Ścieżki do zasobów i ikon
-    icon_path = Path(__file__).parent.parent / "app" / "resources" / "icon.ico"
+    icon_path = ICON_PATH
     if not icon_path.exists():
         print("⚠️ Nie znaleziono ikony aplikacji!")
         icon_path = None
     
-    # Lista dodatkowych modułów do włączenia
-    hidden_imports = [
-        "ipaddress",
-        "collections.abc",
-        "PyQt6",
-        "PyQt6.QtWidgets",
-        "PyQt6.QtCore", 
-        "PyQt6.QtGui",
-        "PyQt6.sip",
-        "playwright",
-        "pathlib",
-        "urllib.parse",
-        "urllib.error",
-        "xml.etree.ElementTree",
-        "logging",
-        "json",
-        "ssl",
-        "asyncio",
-        "nest_asyncio",
-        "email.mime.multipart",
-        "email.mime.text",
-        "email.mime.application",
-        "subprocess",
-        "importlib",
-        "importlib.util",
-        "pkg_resources.py2_warn",
-        "pkg_resources._vendor.appdirs",
-        "pkg_resources._vendor.packaging",
-        "pkg_resources._vendor.pyparsing",
-        "dill",
-        "websockets.client",
-        "websockets.connection",
-        "websockets.protocol",
-        "_bootlocale",
-        "encodings",
-        "encodings.idna",
-        "encodings.utf_8",
-        "encodings.ascii"
-    ]
+    # Ukryte importy: wszystkie moduły aplikacji, lista z build_config.py i pełne
+    # pakiety ładowane dynamicznie (bez ręcznie utrzymywanej listy)
+    from PyInstaller.utils.hooks import collect_submodules
+    hidden_imports = [*HIDDEN_IMPORTS, *discover_app_modules()]
+    for package in COLLECT_SUBMODULES:
+        hidden_imports.extend(collect_submodules(package))
+    hidden_imports = list(dict.fromkeys(hidden_imports))
     
     # Dodaj ukryte importy jako argumenty
     hidden_imports_args = [f"--hidden-import={imp}" for imp in hidden_imports]
@@ -121,11 +136,12 @@ except ImportError:
         sys.executable, "-m", "PyInstaller",
         "--name=Fakturator_e-urtica",
         "--noconfirm",
-        "--clean",
         "--distpath=" + dist_dir,
         "--workpath=" + build_dir,
         f"--runtime-hook={runtime_hook_path}",
     ]
+    if clean:
+        cmd.append("--clean")
     
     # Dodaj ikonę, jeśli istnieje
     if icon_path:
@@ -146,20 +162,116 @@ except ImportError:
     # Dodaj ukryte importy
     cmd.extend(hidden_imports_args)
     
+    # Wyklucz zbędne moduły i usuń symbole z bibliotek - mniejszy katalog aplikacji
+    cmd.extend(f"--exclude-module={module}" for module in EXCLUDED_MODULES)
+    if STRIP_BINARIES:
+        cmd.append("--strip")
+    
     # Dodaj dodatkowe opcje
-    cmd.append("--log-level=DEBUG")  # Więcej informacji diagnostycznych
+    cmd.append(f"--log-level={'DEBUG' if verbose else 'INFO'}")  # DEBUG tylko na życzenie
     cmd.append("--windowed")  # Bez konsoli
     
     # Uruchom PyInstaller
     try:
-        print("Wykonuję komendę:")
-        print(" ".join(cmd))
-        subprocess.run(cmd, check=True)
+        # Pełna komenda (kilkadziesiąt argumentów) trafia zawsze do logu PyInstaller,
+        # a na konsolę tylko w trybie szczegółowym
+        if verbose or os.environ.get("BUILD_VERBOSE"):
+            print("Wykonuję komendę:")
+            print(*cmd)
+        pyinstaller_log = os.path.join(build_dir, "pyinstaller.log")
+        run_streamed(cmd, pyinstaller_log)
         print("✅ Aplikacja została zbudowana pomyślnie!")
+        print(f"Log PyInstaller: {pyinstaller_log}")
     except subprocess.CalledProcessError as e:
         print(f"❌ Błąd podczas budowania aplikacji: {e}")
         return False
     
+    return True
+
+def build_with_nuitka(dist_dir, build_dir, verbose=False):
+    """
+    Buduje aplikację za pomocą Nuitka (kompilacja do C, tryb standalone).
+    
+    Katalog wynikowy Nuitka (main.dist) jest przenoszony do dist/Fakturator_e-urtica,
+    tak jak katalog tworzony przez PyInstaller.
+    """
+    try:
+        importlib.metadata.version("nuitka")
+    except importlib.metadata.PackageNotFoundError:
+        print("⚠️ Instaluję Nuitka...")
+        subprocess.run(pip_install_cmd("nuitka"), check=True)
+    
+    nuitka_dir = os.path.join(build_dir, "nuitka")
+    cmd = [
+        sys.executable, "-m", "nuitka",
+        "--standalone",
+        "--assume-yes-for-downloads",
+        "--enable-plugin=pyqt6",
+        "--include-package=playwright",
+        "--include-package-data=playwright",
+        "--include-data-dir=config=config",
+        "--include-data-dir=app/resources=app/resources",
+        f"--output-dir={nuitka_dir}",
+        "--output-filename=Fakturator_e-urtica",
+        "--windows-console-mode=disable",
+    ]
+    
+    # Te same wykluczenia co w buildzie PyInstaller
+    cmd.extend(f"--nofollow-import-to={module}" for module in EXCLUDED_MODULES)
+    
+    if sys.platform == "win32" and ICON_PATH.exists():
+        cmd.append(f"--windows-icon-from-ico={ICON_PATH}")
+    
+    # Dodaj plik główny
+    cmd.append("app/main.py")
+    
+    try:
+        if verbose or os.environ.get("BUILD_VERBOSE"):
+            print("Wykonuję komendę:")
+            print(*cmd)
+        nuitka_log = os.path.join(build_dir, "nuitka.log")
+        run_streamed(cmd, nuitka_log)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Błąd podczas budowania aplikacji (Nuitka): {e}")
+        return False
+    
+    app_dir = os.path.join(dist_dir, "Fakturator_e-urtica")
+    if os.path.exists(app_dir):
+        shutil.rmtree(app_dir)
+    shutil.move(os.path.join(nuitka_dir, "main.dist"), app_dir)
+    print("✅ Aplikacja została zbudowana pomyślnie (Nuitka)!")
+    print(f"Log Nuitka: {nuitka_log}")
+    return True
+
+def build_executable(clean=False, shortcut=None, verbose=False, backend="pyinstaller"):
+    """
+    Buduje plik wykonywalny za pomocą PyInstaller (lub Nuitka, gdy backend="nuitka").
+    
+    Wyniki analizy w build/ są ponownie używane (PyInstaller sam wykrywa zmienione
+    pliki); clean=True czyści cache PyInstaller i wymusza pełną analizę.
+    shortcut=True/False tworzy/pomija skrót na pulpicie bez pytania; przy None
+    użytkownik jest pytany tylko w sesji interaktywnej. verbose=True włącza
+    szczegółowe logi PyInstaller.
+    """
+    print("🚀 Budowanie aplikacji...")
+    
+    # PyInstaller i wymagane pakiety (pomijane, gdy wymagania się nie zmieniły)
+    install_requirements()
+    
+    # Tworzenie katalogu dla plików tymczasowych - osobny cache analizy dla każdej
+    # wersji Pythona i systemu, żeby nie mieszać wyników różnych interpreterów
+    build_dir = os.path.join("build", f"py{sys.version_info.major}{sys.version_info.minor}-{sys.platform}")
+    dist_dir = "dist"
+    create_directory(build_dir)
+    create_directory(dist_dir)
+    
+    # Budowanie wybranym narzędziem - wynik w obu przypadkach trafia do dist/Fakturator_e-urtica
+    if backend == "nuitka":
+        if not build_with_nuitka(dist_dir, build_dir, verbose):
+            return False
+    elif not build_with_pyinstaller(dist_dir, build_dir, clean, verbose):
+        return False
+    
     # Kopiowanie gotowego executable do głównego katalogu
     try:
         # Sprawdź, czy mamy folder czy pojedynczy plik
@@ -172,7 +284,8 @@ except ImportError:
                 # Kopiuj cały katalog do głównego folderu
                 if os.path.exists("Fakturator_e-urtica"):
                     shutil.rmtree("Fakturator_e-urtica")
-                shutil.copytree(folder_path, "Fakturator_e-urtica")
+                # Pliki są dowiązywane do dist/ zamiast kopiowane (inny dysk - zwykła kopia)
+                shutil.copytree(folder_path, "Fakturator_e-urtica", symlinks=True, copy_function=link_or_copy)
                 print("✅ Katalog z aplikacją skopiowany do katalogu głównego")
                 exe_path = os.path.join("Fakturator_e-urtica", "Fakturator_e-urtica")
             except Exception as e:
@@ -193,8 +306,11 @@ except ImportError:
         print(f"❌ Błąd podczas kopiowania pliku wykonawczego: {e}")
         return False
     
-    # Zapytaj o utworzenie skrótu na pulpicie
-    create_shortcut = input("Czy chcesz utworzyć skrót na pulpicie? (T/n): ").lower() != 'n'
+    # Zapytaj o utworzenie skrótu na pulpicie, chyba że decyzja padła w opcjach
+    # (bez terminala, np. w CI, skrót jest pomijany zamiast blokować build)
+    create_shortcut = shortcut
+    if create_shortcut is None:
+        create_shortcut = is_interactive() and input("Czy chcesz utworzyć skrót na pulpicie? (T/n): ").lower() != 'n'
     
     if create_shortcut and exe_path:
         try:
@@ -204,46 +320,71 @@ except ImportError:
     
     return True
 
+def powershell_quote(value):
+    """Zwraca wartość jako literał PowerShell w apostrofach (bez rozwijania $, ` i cudzysłowów)."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+def create_windows_shortcut(shortcut_path, target_path, working_dir):
+    """
+    Tworzy skrót .lnk przez WScript.Shell.
+    
+    Z pywin32 obiekt COM jest wywoływany w tym procesie; bez niego skrót tworzy
+    PowerShell (wolniejszy start procesu).
+    """
+    try:
+        from win32com.client import Dispatch
+    except ImportError:
+        Dispatch = None
+    
+    if Dispatch is not None:
+        shortcut = Dispatch("WScript.Shell").CreateShortcut(str(shortcut_path))
+        shortcut.TargetPath = str(target_path)
+        shortcut.WorkingDirectory = str(working_dir)
+        shortcut.Save()
+        return
+    
+    # Komenda PowerShell do utworzenia skrótu - ścieżki jako literały w apostrofach,
+    # żeby PowerShell nie interpretował w nich znaków $, ` ani cudzysłowów
+    ps_command = f'''
+    $WshShell = New-Object -ComObject WScript.Shell
+    $Shortcut = $WshShell.CreateShortcut({powershell_quote(shortcut_path)})
+    $Shortcut.TargetPath = {powershell_quote(target_path)}
+    $Shortcut.WorkingDirectory = {powershell_quote(working_dir)}
+    $Shortcut.Save()
+    '''
+    
+    # Wykonaj komendę PowerShell
+    subprocess.run(["powershell", "-Command", ps_command], check=True)
+
 def create_desktop_shortcut(exe_path):
     """Tworzy skrót na pulpicie."""
+    # Ścieżki wyznaczane raz dla wszystkich systemów
+    desktop_path = Path.home() / "Desktop"
+    app_path = Path(exe_path).resolve()
+    app_dir = app_path.parent
+    
     # Różne systemy operacyjne
     if sys.platform == 'win32':
-        # Windows - użyj PowerShell do utworzenia skrótu
-        desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-        app_path = os.path.abspath(exe_path)
-        
-        # Komenda PowerShell do utworzenia skrótu
-        ps_command = f'''
-        $WshShell = New-Object -ComObject WScript.Shell
-        $Shortcut = $WshShell.CreateShortcut("{desktop_path}\\Fakturator e-urtica.lnk")
-        $Shortcut.TargetPath = "{app_path}"
-        $Shortcut.WorkingDirectory = "{os.path.dirname(app_path)}"
-        $Shortcut.Save()
-        '''
-        
-        # Wykonaj komendę PowerShell
-        subprocess.run(["powershell", "-Command", ps_command], check=True)
-        print(f"✅ Skrót utworzony na pulpicie: {desktop_path}\\Fakturator e-urtica.lnk")
+        # Windows - skrót .lnk przez COM (WScript.Shell)
+        shortcut_path = desktop_path / "Fakturator e-urtica.lnk"
+        create_windows_shortcut(shortcut_path, app_path, app_dir)
+        print(f"✅ Skrót utworzony na pulpicie: {shortcut_path}")
     
     elif sys.platform == 'linux':
         # Linux - utwórz plik .desktop
-        desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-        app_path = os.path.abspath(exe_path)
-        icon_path = os.path.abspath(os.path.join("app", "resources", "icon.ico"))
-        
         # Zawartość pliku .desktop
         desktop_file_content = f'''[Desktop Entry]
 Type=Application
 Name=Fakturator e-urtica
 Comment=Aplikacja do pobierania faktur e-urtica
 Exec="{app_path}"
-Icon={icon_path}
+Icon={ICON_PATH}
 Terminal=false
 Categories=Office;
 '''
         
         # Zapisz plik .desktop
-        desktop_file_path = os.path.join(desktop_path, "fakturator-e-urtica.desktop")
+        desktop_file_path = desktop_path / "fakturator-e-urtica.desktop"
         with open(desktop_file_path, 'w') as f:
             f.write(desktop_file_content)
         
@@ -253,17 +394,14 @@ Categories=Office;
     
     elif sys.platform == 'darwin':
         # macOS - utwórz plik .command
-        desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-        app_path = os.path.abspath(exe_path)
-        
         # Zawartość pliku .command
         command_file_content = f'''#!/bin/bash
-cd "{os.path.dirname(app_path)}"
+cd "{app_dir}"
 "{app_path}"
 '''
         
         # Zapisz plik .command
-        command_file_path = os.path.join(desktop_path, "Fakturator e-urtica.command")
+        command_file_path = desktop_path / "Fakturator e-urtica.command"
         with open(command_file_path, 'w') as f:
             f.write(command_file_content)
         
@@ -275,11 +413,25 @@ cd "{os.path.dirname(app_path)}"
         print(f"⚠️ Nieobsługiwany system operacyjny: {sys.platform}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Budowanie aplikacji Fakturator e-urtica")
+    parser.add_argument("--clean", action="store_true",
+                        help="Wyczyść cache PyInstaller i wykonaj pełną analizę")
+    shortcut_group = parser.add_mutually_exclusive_group()
+    shortcut_group.add_argument("--shortcut", "--yes", "-y", dest="shortcut", action="store_const", const=True,
+                                help="Utwórz skrót na pulpicie bez pytania")
+    shortcut_group.add_argument("--no-shortcut", dest="shortcut", action="store_const", const=False,
+                                help="Nie twórz skrótu na pulpicie")
+    parser.add_argument("--backend", choices=["pyinstaller", "nuitka"], default="pyinstaller",
+                        help="Narzędzie do budowania (domyślnie PyInstaller)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Szczegółowe logi PyInstaller (--log-level=DEBUG)")
+    args = parser.parse_args()
+    
     # Upewnij się, że katalog scripts istnieje
     create_directory("scripts")
     
     # Ustawienie katalogu roboczego
-    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.chdir(ROOT)
     
     # Budowanie aplikacji
-    build_executable() 
\ No newline at end of file
+    build_executable(clean=args.clean, shortcut=args.shortcut, verbose=args.verbose, backend=args.backend) 
\ No newline at end of file